@@ -0,0 +1,10 @@
+# 成绩预测应用热点路径的基准测试
+#
+# 用法（在仓库根目录执行）：
+#   python -m benchmarks.run --sizes 50000 500000 5000000 --out bench_results.json
+#   python -m benchmarks.compare 旧结果.json 新结果.json
+#   python -m benchmarks.rerun_latency --repeat 20 --baseline 旧重跑结果.json   # 各Streamlit应用的重跑延迟
+#   python -m benchmarks.import_time   # 成绩预测应用按页面延迟导入前后的导入耗时
+#   python -m benchmarks.load_test --spawn --requests 5000 --concurrency 64   # 推理服务吞吐量与尾延迟
+#   python -m benchmarks.memory_footprint --rows 50000 500000   # 学生数据紧凑类型规整前后的内存占用
+#   python -m benchmarks.worker_memory --workers 4 --rows 500000   # 多进程共享只读数据/模型时每个进程的内存成本
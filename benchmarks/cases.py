@@ -0,0 +1,120 @@
+# 基准测试用例：直接调用 streamlit_score_predict.py 里的函数（无界面的bare模式运行）
+#
+# 每个用例返回 (setup, run)：setup 在每次计时前执行、不计入耗时，run 为被测代码
+import os
+
+import numpy as np
+
+from score_features import INPUT_COLUMNS, encode_features, encode_single
+
+CASES = {}
+
+
+def case(name, repeat):
+    def register(func):
+        CASES[name] = (func, repeat)
+        return func
+    return register
+
+
+def _noop():
+    pass
+
+
+def _clear_arrow_cache(csv_path):
+    # 删除数据访问层为该CSV生成的Arrow缓存与版本索引，模拟首次冷启动；
+    # 按确切的缓存文件名匹配，students_50000 不会连带删掉 students_500000 的缓存
+    from score_data import _index_path, _version_caches
+    for path in _version_caches(csv_path) + [_index_path(csv_path)]:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@case("load_resources_cold", repeat=1)
+def load_resources_cold(app, csv_path):
+    def setup():
+        _clear_arrow_cache(csv_path)
+        app.load_resources.clear()
+    return setup, app.load_resources
+
+
+@case("load_resources_warm", repeat=5)
+def load_resources_warm(app, csv_path):
+    app.load_resources()
+    return app.load_resources.clear, app.load_resources
+
+
+@case("get_dataframe_from_csv", repeat=5)
+def get_dataframe_from_csv(app, csv_path):
+    app.get_dataframe_from_csv()
+    return _noop, app.get_dataframe_from_csv
+
+
+@case("page2_cold_cube", repeat=5)
+def page2_cold_cube(app, csv_path):
+    # 每次都清掉聚合立方体缓存：包含一次全量聚合 + 表格/图表构建
+    df = app.get_dataframe_from_csv()
+    return app.get_major_cube.clear, lambda: app.page2_major_analysis(df)
+
+
+@case("page2_warm_cube", repeat=5)
+def page2_warm_cube(app, csv_path):
+    # 立方体已缓存：只剩页面重跑时的表格/图表构建
+    df = app.get_dataframe_from_csv()
+    app.page2_major_analysis(df)
+    return _noop, lambda: app.page2_major_analysis(df)
+
+
+def _single_prediction_case(app, predict):
+    # 绕过预测缓存，测量单条输入的编码 + 模型推理
+    rng = np.random.default_rng(0)
+    state = {}
+
+    def setup():
+        state["inputs"] = {
+            "性别": rng.choice(app.unique_values["性别"]),
+            "专业": rng.choice(app.unique_values["专业"]),
+            "每周学习时长（小时）": rng.uniform(0, 50),
+            "上课出勤率": rng.uniform(0, 1),
+            "期中考试分数": rng.uniform(0, 100),
+            "作业完成率": rng.uniform(0, 1),
+        }
+
+    def run():
+        vector = encode_single(state["inputs"], app.feature_names)
+        predict(vector.reshape(1, -1))
+
+    return setup, run
+
+
+@case("predict_single", repeat=200)
+def predict_single(app, csv_path):
+    return _single_prediction_case(app, app.model.predict)
+
+
+@case("predict_interval_single", repeat=200)
+def predict_interval_single(app, csv_path):
+    # 同样的输入，同一次遍历额外给出各棵树的预测区间，与 predict_single 对比开销
+    return _single_prediction_case(app, app.model.predict_interval)
+
+
+@case("predict_batch_100k", repeat=3)
+def predict_batch(app, csv_path):
+    frame = app.df[INPUT_COLUMNS].head(100_000)
+    return _noop, lambda: app.model.predict(encode_features(frame, app.feature_names))
+
+
+@case("id_prefix_search", repeat=1000)
+def id_prefix_search(app, csv_path):
+    # 学号自动补全：在排序的学号索引上按随机前缀取前10个匹配（索引构建只做一次，不计时）
+    from score_id_index import StudentIdIndex
+    index = StudentIdIndex(app.df["学号"])
+    ids = app.df["学号"].astype(str).to_numpy()
+    rng = np.random.default_rng(0)
+    state = {}
+
+    def setup():
+        student_id = ids[rng.integers(len(ids))]
+        state["prefix"] = student_id[:rng.integers(1, len(student_id) + 1)]
+
+    return setup, lambda: index.search(state["prefix"], limit=10)
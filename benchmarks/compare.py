@@ -0,0 +1,30 @@
+# 对比两次基准测试结果：按（数据规模, 用例）输出耗时和峰值内存的变化倍数
+import argparse
+import json
+
+
+def _index(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {(r["rows"], r["case"]): r for r in report["results"] if "error" not in r}, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比两次基准测试结果")
+    parser.add_argument("baseline", help="基准结果JSON")
+    parser.add_argument("candidate", help="新结果JSON")
+    args = parser.parse_args()
+
+    old, old_report = _index(args.baseline)
+    new, new_report = _index(args.candidate)
+    print(f"基准：{old_report.get('git_commit')}  新：{new_report.get('git_commit')}")
+    print(f"{'行数':>9}  {'用例':<24}{'旧耗时ms':>12}{'新耗时ms':>12}{'加速':>8}{'旧RSS':>10}{'新RSS':>10}")
+    for key in sorted(old.keys() & new.keys()):
+        a, b = old[key], new[key]
+        speedup = a["wall_median_s"] / b["wall_median_s"] if b["wall_median_s"] else float("inf")
+        print(f"{key[0]:>9}  {key[1]:<24}{a['wall_median_s'] * 1000:12.2f}{b['wall_median_s'] * 1000:12.2f}"
+              f"{speedup:7.2f}x{a['peak_rss_mb'] or 0:10.1f}{b['peak_rss_mb'] or 0:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# 基准测试用的合成学生数据：由 generate_student_data.py 按真实数据的分布生成，列名与编码一致
+import json
+import os
+
+from generate_student_data import learn_profile, write_dataset
+
+DATA_DIR = ".bench_data"
+SOURCE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "student_data_adjusted_rounded.csv")
+
+
+def _profile(data_dir):
+    # 分布描述只学习一次，缓存为JSON
+    path = os.path.join(data_dir, "profile.json")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    profile = learn_profile(SOURCE_CSV)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False)
+    return profile
+
+
+def synthetic_csv(n_rows, data_dir=DATA_DIR):
+    """返回指定行数的合成CSV路径；已存在则直接复用"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"students_{n_rows}.csv")
+    if not os.path.exists(path):
+        write_dataset(_profile(data_dir), n_rows, path)
+    return path
@@ -0,0 +1,78 @@
+# 扁平化森林与 sklearn 的一致性检查：对同一个 RandomForestRegressor，比较
+# FlatForest.from_sklearn(rfr).predict(X) 与 rfr.predict(X)，覆盖单条、所有树一起遍历（<1024行）
+# 和按树遍历（>=1024行，含跨越分块边界）三条路径；predict_interval 的第一列也必须与 predict 一致。
+# 两者只在浮点求和顺序上不同，差异应在 1e-9 以内，超出时以非零状态退出
+#
+# 用法（在仓库根目录执行，需要旧的 joblib 模型文件）：
+#   python -m benchmarks.forest_equivalence
+#   python -m benchmarks.forest_equivalence --csv student_data_adjusted_rounded.csv
+import argparse
+import os
+import pickle
+import sys
+
+import numpy as np
+
+from benchmarks.run import REPO_ROOT
+
+TOLERANCE = 1e-9
+
+
+def row_counts():
+    from score_forest import TREE_MAJOR_CHUNK_ROWS, TREE_MAJOR_MIN_ROWS
+    return [1, 2, 500, TREE_MAJOR_MIN_ROWS - 1, TREE_MAJOR_MIN_ROWS, 5000, TREE_MAJOR_CHUNK_ROWS + 1000]
+
+
+def check(model_path, feature_names_path, csv_path, seed=0):
+    """返回 [(行数, predict最大差异, predict_interval首列最大差异)]"""
+    from joblib import load
+
+    from score_data import load_student_frame
+    from score_features import INPUT_COLUMNS, encode_features
+    from score_forest import FlatForest
+
+    rfr = load(model_path)
+    with open(feature_names_path, "rb") as f:
+        feature_names = pickle.load(f)
+    forest = FlatForest.from_sklearn(rfr, feature_names)
+
+    # 真实数据行有放回抽样，行数可以超过数据集本身
+    frame = load_student_frame(csv_path, columns=INPUT_COLUMNS, dropna=True)
+    rng = np.random.default_rng(seed)
+    results = []
+    for n_rows in row_counts():
+        X = encode_features(frame.iloc[rng.integers(0, len(frame), n_rows)], feature_names)
+        expected = rfr.predict(X)
+        predicted = forest.predict(X)
+        interval = forest.predict_interval(X)
+        results.append((
+            n_rows,
+            float(np.max(np.abs(predicted - expected))),
+            float(np.max(np.abs(interval[:, 0] - predicted))),
+        ))
+    return results
+
+
+def main():
+    from score_paths import DEFAULT_PATHS
+
+    parser = argparse.ArgumentParser(description="扁平化森林与 sklearn 的一致性检查")
+    parser.add_argument("--model", default=DEFAULT_PATHS["model_path"], help="joblib 格式的 RandomForestRegressor")
+    parser.add_argument("--feature-names", default=DEFAULT_PATHS["feature_names_path"])
+    parser.add_argument("--csv", default=DEFAULT_PATHS["csv_path"], help="抽样输入的学生数据")
+    args = parser.parse_args()
+
+    os.chdir(REPO_ROOT)
+    sys.path.insert(0, REPO_ROOT)
+    failed = False
+    print(f"{'行数':>8} {'predict最大差异':>16} {'区间首列差异':>14}")
+    for n_rows, predict_diff, interval_diff in check(args.model, args.feature_names, args.csv):
+        ok = predict_diff <= TOLERANCE and interval_diff == 0
+        failed |= not ok
+        print(f"{n_rows:>8} {predict_diff:>16.3g} {interval_diff:>14.3g}  {'OK' if ok else '不一致'}")
+    if failed:
+        raise SystemExit(f"FlatForest 与 sklearn 的预测不一致（容差 {TOLERANCE:g}）")
+
+
+if __name__ == "__main__":
+    main()
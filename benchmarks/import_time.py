@@ -0,0 +1,92 @@
+# 成绩预测应用的导入耗时报告：对比拆分前（所有库在脚本顶部导入）与按页面延迟导入后，
+# 冷启动进入每个页面需要的导入时间
+#
+# 用法（在仓库根目录执行）：
+#   python -m benchmarks.import_time --repeat 5
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.run import REPO_ROOT
+
+APP_SCRIPT = os.path.join(REPO_ROOT, "streamlit_score_predict.py")
+
+
+def top_level_imports(path):
+    """脚本模块层的 import / from ... import 语句导入的模块（按出现顺序去重；函数内的延迟导入不计）"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+# 应用脚本顶部的导入：直接从 streamlit_score_predict.py 解析，脚本增删导入时无需同步
+SHELL_IMPORTS = top_level_imports(APP_SCRIPT)
+# 拆分前脚本顶部的全部导入：无论进入哪个页面都要付出这些时间
+LEGACY_IMPORTS = SHELL_IMPORTS + [
+    "pickle", "os", "plotly.express", "plotly.graph_objects", "joblib", "io", "matplotlib.pyplot", "seaborn",
+    "score_batch", "score_features",
+]
+PAGE_MODULES = {
+    "项目介绍": "score_page_intro",
+    "专业数据分析": "score_page_analysis",
+    "成绩预测": "score_page_predict",
+}
+
+
+def measure(modules):
+    """在全新的解释器里导入给定模块，返回 (总耗时ms, {顶层模块: 累计耗时ms})"""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    per_module = {}
+    for line in proc.stderr.splitlines():
+        # 格式：import time: self [us] | cumulative | imported package；顶层导入的包名前没有缩进
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  ") and name.strip():
+            per_module[name.strip()] = int(cumulative) / 1000
+    return sum(per_module.values()), per_module
+
+
+def median_measure(modules, repeat):
+    runs = [measure(modules) for _ in range(repeat)]
+    total = statistics.median(r[0] for r in runs)
+    # 各模块耗时取中位数；同一包被前面的模块间接导入时不再单独计入
+    names = runs[0][1]
+    per_module = {name: statistics.median(r[1].get(name, 0) for r in runs) for name in names}
+    return total, per_module
+
+
+def main():
+    parser = argparse.ArgumentParser(description="成绩预测应用导入耗时报告")
+    parser.add_argument("--repeat", type=int, default=5, help="每组导入重复测量次数（取中位数）")
+    parser.add_argument("--top", type=int, default=8, help="每组列出耗时最多的前N个顶层模块")
+    args = parser.parse_args()
+
+    legacy_total, legacy_modules = median_measure(LEGACY_IMPORTS, args.repeat)
+    print(f"拆分前（任意页面）：{legacy_total:8.1f} ms")
+    for name, ms in sorted(legacy_modules.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"    {name:<28}{ms:8.1f} ms")
+
+    print()
+    print(f"{'页面':<10}{'拆分前ms':>12}{'拆分后ms':>12}{'节省ms':>10}{'加速':>8}")
+    for page, module in PAGE_MODULES.items():
+        total, _ = median_measure(SHELL_IMPORTS + [module], args.repeat)
+        print(f"{page:<10}{legacy_total:12.1f}{total:12.1f}{legacy_total - total:10.1f}"
+              f"{legacy_total / total:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# 推理服务压测：固定并发数的闭环压测（每个并发连接收到响应后立即发下一个请求），
+# 报告吞吐量和延迟分位数；可选自动启动一个本地 score_server.py
+#
+# 用法（在仓库根目录执行）：
+#   python -m benchmarks.load_test --spawn --requests 5000 --concurrency 64
+#   python -m benchmarks.load_test --url http://127.0.0.1:8600 --batch-size 100
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+from benchmarks.run import REPO_ROOT
+from score_features import SLIDER_RANGES
+
+
+def random_rows(categories, n, rng):
+    rows = []
+    for _ in range(n):
+        row = {col: str(rng.choice(values)) for col, values in categories.items()}
+        row.update({col: round(float(rng.uniform(low, high)), 2) for col, (low, high) in SLIDER_RANGES.items()})
+        rows.append(row)
+    return rows
+
+
+async def _wait_until_ready(client, url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            response = await client.fetch(f"{url}/health")
+            return json.loads(response.body)
+        except (ConnectionError, HTTPClientError, OSError):
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def run_load(url, n_requests, concurrency, batch_size, seed=0):
+    client = AsyncHTTPClient(max_clients=concurrency)
+    health = await _wait_until_ready(client, url)
+    rng = np.random.default_rng(seed)
+    # 预先生成并序列化请求体，压测时不计入客户端的构造开销
+    if batch_size:
+        endpoint = f"{url}/predict/batch"
+        bodies = [json.dumps({"rows": random_rows(health["categories"], batch_size, rng)}, ensure_ascii=False)
+                  for _ in range(min(n_requests, 200))]
+    else:
+        endpoint = f"{url}/predict"
+        bodies = [json.dumps(row, ensure_ascii=False) for row in random_rows(health["categories"], min(n_requests, 5000), rng)]
+
+    latencies = []
+    errors = 0
+    counter = iter(range(n_requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await client.fetch(endpoint, method="POST", body=bodies[i % len(bodies)],
+                                   headers={"Content-Type": "application/json"})
+            except (HTTPClientError, OSError):
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    after = json.loads((await client.fetch(f"{url}/health")).body)
+    client.close()
+    return latencies, errors, elapsed, after["batcher"]
+
+
+def _spawn_server(port, max_batch, max_wait_ms):
+    return subprocess.Popen(
+        [sys.executable, "score_server.py", "--port", str(port),
+         "--max-batch", str(max_batch), "--max-wait-ms", str(max_wait_ms)],
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="成绩预测推理服务压测")
+    parser.add_argument("--url", default="http://127.0.0.1:8600", help="推理服务地址")
+    parser.add_argument("--requests", type=int, default=5000, help="总请求数")
+    parser.add_argument("--concurrency", type=int, default=64, help="并发连接数")
+    parser.add_argument("--batch-size", type=int, default=0, help="大于0时压测批量接口，每个请求包含的行数")
+    parser.add_argument("--spawn", action="store_true", help="自动启动本地推理服务（使用 --url 中的端口）")
+    parser.add_argument("--max-batch", type=int, default=256, help="--spawn 时服务端的微批上限")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="--spawn 时服务端的攒批等待时间")
+    args = parser.parse_args()
+
+    server = _spawn_server(int(args.url.rsplit(":", 1)[1]), args.max_batch, args.max_wait_ms) if args.spawn else None
+    try:
+        latencies, errors, elapsed, batcher = asyncio.run(
+            run_load(args.url, args.requests, args.concurrency, args.batch_size)
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    ms = np.asarray(latencies) * 1000
+    rows = len(latencies) * (args.batch_size or 1)
+    print(f"接口：{'批量（每请求%d行）' % args.batch_size if args.batch_size else '单条'}  并发：{args.concurrency}")
+    print(f"成功 {len(latencies)} 个，失败 {errors} 个，耗时 {elapsed:.2f} 秒")
+    print(f"吞吐量：{len(latencies) / elapsed:.0f} 请求/秒，{rows / elapsed:.0f} 行/秒")
+    if len(ms):
+        print(f"延迟：p50 {np.percentile(ms, 50):.1f} ms  p95 {np.percentile(ms, 95):.1f} ms  "
+              f"p99 {np.percentile(ms, 99):.1f} ms  最大 {ms.max():.1f} ms  平均 {statistics.fmean(ms):.1f} ms")
+    if not args.batch_size:
+        print(f"服务端微批：共 {batcher['batches']} 批，平均 {batcher['mean_batch']:.1f} 条/批，最大 {batcher['largest_batch']} 条")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# 学生数据内存占用报告：对比原始 pd.read_csv 加载、规整前的Arrow加载（float64 + 字符串学号）
+# 与规整后的紧凑类型（float32 + int64学号 + int8编码分类），每种方式在独立子进程中加载，
+# 报告DataFrame各列占用（deep）和进程常驻内存（RSS）增量
+#
+# 用法（在仓库根目录执行）：
+#   python -m benchmarks.memory_footprint --rows 50000 500000
+#   python -m benchmarks.memory_footprint --csv student_data_adjusted_rounded.csv
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.run import REPO_ROOT, RESULT_MARKER
+
+LOADERS = ["legacy_read_csv", "arrow_float64", "compact"]
+
+
+def _current_rss_mb():
+    # 当前常驻内存（不是峰值）；只支持Linux
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def _load(loader, csv_path):
+    import pandas as pd
+
+    if loader == "legacy_read_csv":
+        # 与最初的 load_resources 相同
+        frame = pd.read_csv(csv_path, encoding="utf-8-sig", dtype={"学号": str, "性别": "category", "专业": "category"})
+        return frame.dropna()
+    import score_data
+    if loader == "arrow_float64":
+        # 规整前的数据访问层：学号为字符串，数值列为float64
+        import pyarrow.csv as pa_csv
+        table = pa_csv.read_csv(
+            csv_path,
+            read_options=pa_csv.ReadOptions(encoding=score_data._detect_encoding(csv_path)),
+            convert_options=pa_csv.ConvertOptions(column_types=score_data.COLUMN_TYPES),
+        )
+        return table.to_pandas().dropna()
+    return score_data.load_student_frame(csv_path, dropna=True)
+
+
+def run_worker(loader, csv_path):
+    """子进程：加载一次，打印各列占用和RSS增量"""
+    import gc
+
+    import pandas  # noqa: F401  先导入库，RSS增量只计数据本身
+    import pyarrow  # noqa: F401
+
+    sys.path.insert(0, REPO_ROOT)
+    if loader == "compact":
+        # 先完成一次转换，计量的是日常的内存映射加载
+        import score_data
+        score_data.load_student_table(csv_path)
+    gc.collect()
+    before = _current_rss_mb()
+    df = _load(loader, csv_path)
+    gc.collect()
+    after = _current_rss_mb()
+    usage = df.memory_usage(deep=True, index=False)
+    print(RESULT_MARKER + json.dumps({
+        "loader": loader,
+        "rows": len(df),
+        "columns": {col: [str(df[col].dtype), int(usage[col])] for col in df.columns},
+        "frame_mb": usage.sum() / 1024 / 1024,
+        "rss_mb": None if before is None else after - before,
+    }, ensure_ascii=False), flush=True)
+
+
+def measure(loader, csv_path):
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.memory_footprint", "--worker", loader, "--csv", csv_path],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise RuntimeError(proc.stderr)
+
+
+def report(csv_path):
+    results = [measure(loader, csv_path) for loader in LOADERS]
+    legacy, compact = results[0], results[-1]
+    print(f"{csv_path}（{compact['rows']} 行）")
+    print(f"  {'列':<14}" + "".join(f"{r['loader']:>26}" for r in results))
+    for col in compact["columns"]:
+        cells = []
+        for r in results:
+            dtype, nbytes = r["columns"].get(col, ("-", 0))
+            cells.append(f"{dtype:>12} {nbytes / 1024 / 1024:9.2f} MB")
+        print(f"  {col:<14}" + "".join(f"{cell:>26}" for cell in cells))
+    print(f"  {'DataFrame合计':<14}" + "".join(f"{r['frame_mb']:23.2f} MB" for r in results))
+    if all(r["rss_mb"] is not None for r in results):
+        print(f"  {'RSS增量':<14}" + "".join(f"{r['rss_mb']:23.2f} MB" for r in results))
+    print(f"  紧凑类型 vs 原始加载：DataFrame {legacy['frame_mb'] / compact['frame_mb']:.2f}x"
+          + (f"，RSS {legacy['rss_mb'] / compact['rss_mb']:.2f}x" if compact["rss_mb"] else ""))
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="学生数据内存占用报告")
+    parser.add_argument("--rows", type=int, nargs="*", default=[50_000, 500_000], help="合成数据的行数")
+    parser.add_argument("--csv", help="直接使用指定CSV（忽略 --rows）")
+    parser.add_argument("--worker", choices=LOADERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.csv)
+        return
+    if args.csv:
+        report(os.path.abspath(args.csv))
+        return
+    from benchmarks.datasets import synthetic_csv
+    for n_rows in args.rows:
+        report(os.path.abspath(synthetic_csv(n_rows, data_dir=os.path.join(REPO_ROOT, ".bench_data"))))
+
+
+if __name__ == "__main__":
+    main()
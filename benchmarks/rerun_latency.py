@@ -0,0 +1,210 @@
+# Streamlit应用重跑延迟测试：用 streamlit.testing 的 AppTest 无界面驱动各应用，
+# 按脚本化的交互（切换导航、拖动滑块、修改多选筛选、提交表单）记录每次重跑的耗时与渲染元素数
+#
+# 用法（在仓库根目录执行）：
+#   python -m benchmarks.rerun_latency --repeat 20 --out rerun_results.json
+#   python -m benchmarks.rerun_latency --apps streamlit_score_predict.py sjxs.py
+#   python -m benchmarks.rerun_latency --baseline 优化前.json   # 同时输出与优化前的p50/p95对比
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+
+from benchmarks.run import REPO_ROOT, _git_commit
+
+
+# -------------------------- 交互步骤 --------------------------
+# 每个步骤为 (页面, 动作说明, 函数)；函数接收 (AppTest, 第i次重复) 并返回待 run() 的 AppTest，
+# 用 i 让输入在重复之间变化，避免命中缓存后测不到真实的重跑开销
+def _by_label(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"未找到控件：{label}")
+
+
+def _nav(container_attr, label, page):
+    def step(at, i):
+        widgets = getattr(at.sidebar if container_attr.startswith("sidebar.") else at, container_attr.split(".")[-1])
+        return _by_label(widgets, label).set_value(page)
+    return step
+
+
+def _score_predict_steps():
+    nav = "sidebar.radio"
+    steps = [(page, "切换导航", _nav(nav, " ", page)) for page in ["项目介绍", "专业数据分析", "成绩预测"]]
+    steps += [
+        ("成绩预测", "拖动学习时长滑块",
+         lambda at, i: _by_label(at.slider, "每周学习时长（小时）").set_value(10.0 + i % 30)),
+        ("成绩预测", "点击预测按钮",
+         lambda at, i: _by_label(at.button, "预测期末成绩").click()),
+    ]
+    return steps
+
+
+def _portal_steps(nav):
+    # db.py / cb.py：同一套模块，只是导航位置不同（顶部横向 / 侧边栏）
+    label = "导航" if nav == "radio" else "选择功能模块"
+    modules = ["首页", "南宁美食数据仪表", "图片切换展示", "简易音乐播放器", "视频中心", "鹿晗个人档案", "个人简历生成器"]
+    steps = [(module, "切换导航", _nav(nav, label, module)) for module in modules]
+    steps += [
+        ("个人简历生成器", "修改语言多选",
+         lambda at, i: _by_label(at.multiselect, "语言能力").set_value(["中文", "英语", "德语"][: 1 + i % 3])),
+        ("个人简历生成器", "拖动工作经验滑块",
+         lambda at, i: _by_label(at.slider, "工作经验（年）").set_value(i % 30)),
+    ]
+    return steps
+
+
+def _sales_steps():
+    def toggle_filter(label):
+        def step(at, i):
+            widget = _by_label(at.sidebar.multiselect, label)
+            options = list(widget.options)
+            return widget.set_value(options if i % 2 else options[:1])
+        return step
+    return [("销售仪表板", f"修改{label}筛选", toggle_filter(label)) for label in ["城市", "顾客类型", "性别", "产品类型"]]
+
+
+def _penguin_steps():
+    def submit(at, i):
+        for j, label in enumerate(["喙的长度（毫米）", "喙的深度（毫米）", "翅膀的长度（毫米）", "身体质量（克）"]):
+            _by_label(at.number_input, label).set_value([40.0, 18.0, 200.0, 4000.0][j] + i)
+        return _by_label(at.button, "预测分类").click()
+    return [
+        ("简介页面", "切换导航", _nav("sidebar.selectbox", "请选择页面", "简介页面")),
+        ("预测分类页面", "切换导航", _nav("sidebar.selectbox", "请选择页面", "预测分类页面")),
+        ("预测分类页面", "填写并提交表单", submit),
+    ]
+
+
+SCENARIOS = {
+    "streamlit_score_predict.py": _score_predict_steps,
+    "db.py": lambda: _portal_steps("radio"),
+    "cb.py": lambda: _portal_steps("sidebar.radio"),
+    "sjxs.py": _sales_steps,
+    "streamlit_predict_v2.py": _penguin_steps,
+}
+
+
+# -------------------------- 执行与统计 --------------------------
+def count_elements(node):
+    """递归统计一次重跑渲染出的元素数（不含容器本身）"""
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return sum(count_elements(child) for child in children.values())
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summarize(app, page, action, samples):
+    latencies = [s[0] for s in samples]
+    return {
+        "app": app,
+        "page": page,
+        "action": action,
+        "runs": len(samples),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "elements": statistics.median(s[1] for s in samples),
+    }
+
+
+def run_app(app, repeat, timeout):
+    """驱动一个应用：首次运行 + 每个交互步骤重复 repeat 次，返回汇总记录列表"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, app), default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    records = [_summarize(app, "-", "首次运行", [(time.perf_counter() - start, count_elements(at._tree))])]
+    if at.exception:
+        records[0]["error"] = at.exception[0].message
+        return records
+
+    for page, action, step in SCENARIOS[app]():
+        samples = []
+        for i in range(repeat):
+            try:
+                pending = step(at, i)
+            except LookupError as e:
+                records.append({"app": app, "page": page, "action": action, "error": str(e)})
+                break
+            start = time.perf_counter()
+            at = pending.run()
+            samples.append((time.perf_counter() - start, count_elements(at._tree)))
+            if at.exception:
+                records.append({"app": app, "page": page, "action": action, "error": at.exception[0].message})
+                break
+        else:
+            records.append(_summarize(app, page, action, samples))
+    return records
+
+
+def print_comparison(baseline_path, results):
+    """按（应用, 页面, 动作）对比优化前后的p50/p95"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    old = {(r["app"], r["page"], r["action"]): r for r in baseline["results"] if "error" not in r}
+    print(f"\n与基准对比（{baseline.get('git_commit')}）：")
+    print(f"{'应用':<28}{'页面':<12}{'动作':<14}{'旧p50':>9}{'新p50':>9}{'旧p95':>9}{'新p95':>9}{'加速':>8}")
+    for r in results:
+        a = old.get((r["app"], r["page"], r["action"]))
+        if a is None or "error" in r:
+            continue
+        speedup = a["p50_ms"] / r["p50_ms"] if r["p50_ms"] else float("inf")
+        print(f"{r['app']:<28}{r['page']:<12}{r['action']:<14}{a['p50_ms']:9.1f}{r['p50_ms']:9.1f}"
+              f"{a['p95_ms']:9.1f}{r['p95_ms']:9.1f}{speedup:7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit应用重跑延迟测试")
+    parser.add_argument("--apps", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS), help="要测试的应用")
+    parser.add_argument("--repeat", type=int, default=10, help="每个交互步骤重复次数")
+    parser.add_argument("--timeout", type=float, default=120, help="单次重跑超时（秒）")
+    parser.add_argument("--out", default="rerun_results.json", help="结果JSON路径")
+    parser.add_argument("--baseline", help="优化前的结果JSON，给出则输出对比")
+    args = parser.parse_args()
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    # 各应用使用相对路径读取数据和图片
+    os.chdir(REPO_ROOT)
+
+    results = []
+    for app in args.apps:
+        print(f"{app}", flush=True)
+        for record in run_app(app, args.repeat, args.timeout):
+            results.append(record)
+            if "error" in record:
+                print(f"  {record['page']:<12} {record['action']:<14} 失败：{record['error']}", flush=True)
+            else:
+                print(f"  {record['page']:<12} {record['action']:<14} p50 {record['p50_ms']:8.1f} ms  "
+                      f"p95 {record['p95_ms']:8.1f} ms  元素 {record['elements']:.0f}", flush=True)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {args.out}")
+    if args.baseline:
+        print_comparison(args.baseline, results)
+
+
+if __name__ == "__main__":
+    main()
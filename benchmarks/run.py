@@ -0,0 +1,143 @@
+# 基准测试入口：每个（数据规模, 用例）在独立子进程中运行，保证峰值内存互不干扰，结果写入JSON
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = [50_000, 500_000, 5_000_000]
+RESULT_MARKER = "BENCH_RESULT "
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows 没有 resource 模块
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为KB，macOS 为字节
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _import_app(csv_path):
+    # bare模式导入应用：set_page_config 等界面调用不会报错，缓存退化为进程内缓存
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    sys.path.insert(0, REPO_ROOT)
+    import streamlit_score_predict as app
+    app.CONFIG["csv_path"] = csv_path
+    app.load_resources.clear()
+    app.model_slot, app.df = app.load_resources()
+    bundle = app.model_slot.current
+    app.model, app.feature_names, app.unique_values = bundle.model, bundle.feature_names, bundle.unique_values
+    return app
+
+
+def run_worker(case_name, csv_path):
+    """子进程：执行单个用例，把结果以一行JSON打印到stdout"""
+    from benchmarks.cases import CASES
+
+    baseline_rss = _peak_rss_mb()
+    app = _import_app(csv_path)
+    func, repeat = CASES[case_name]
+    setup, run = func(app, csv_path)
+
+    times = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    peak_rss = _peak_rss_mb()
+
+    # 单独再跑一次统计Python/NumPy分配峰值（tracemalloc 会拖慢速度，不与计时混在一起）
+    setup()
+    tracemalloc.start()
+    run()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "case": case_name,
+        "repeat": repeat,
+        "wall_median_s": statistics.median(times),
+        "wall_min_s": min(times),
+        "wall_mean_s": statistics.fmean(times),
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": peak_rss,
+        "peak_traced_alloc_mb": traced_peak / 1024 / 1024,
+    }
+    print(RESULT_MARKER + json.dumps(result, ensure_ascii=False), flush=True)
+
+
+def _run_case_subprocess(case_name, csv_path, timeout):
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--worker", case_name, "--csv", csv_path],
+        cwd=REPO_ROOT, capture_output=True, text=True, encoding="utf-8", timeout=timeout,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    return {"case": case_name, "error": proc.stderr.strip().splitlines()[-1:] or ["未知错误"]}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    from benchmarks.cases import CASES
+    from benchmarks.datasets import synthetic_csv
+
+    parser = argparse.ArgumentParser(description="成绩预测应用热点路径基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="合成数据集行数")
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES), help="要运行的用例")
+    parser.add_argument("--out", default="bench_results.json", help="结果JSON路径")
+    parser.add_argument("--timeout", type=int, default=1800, help="单个用例超时（秒）")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--csv", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args.worker, args.csv)
+
+    results = []
+    for n_rows in args.sizes:
+        print(f"生成/复用 {n_rows} 行合成数据...", flush=True)
+        csv_path = os.path.abspath(synthetic_csv(n_rows, data_dir=os.path.join(REPO_ROOT, ".bench_data")))
+        for case_name in args.cases:
+            result = _run_case_subprocess(case_name, csv_path, args.timeout)
+            result["rows"] = n_rows
+            results.append(result)
+            if "error" in result:
+                print(f"  {case_name:<24} 失败：{result['error'][0]}", flush=True)
+            else:
+                print(f"  {case_name:<24} {result['wall_median_s'] * 1000:10.2f} ms  "
+                      f"峰值RSS {result['peak_rss_mb'] or float('nan'):8.1f} MB  "
+                      f"分配峰值 {result['peak_traced_alloc_mb']:8.1f} MB", flush=True)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {args.out}")
+
+
+if __name__ == "__main__":
+    main()
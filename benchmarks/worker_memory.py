@@ -0,0 +1,119 @@
+# 多工作进程内存报告：同时启动K个进程各自加载学生数据和模型，全部加载完后读取每个进程的
+# /proc/<pid>/smaps_rollup，对比“各自私有一份”（pd.read_csv + joblib模型）与“共享只读映射”
+# （紧凑Arrow缓存 + 模型包，见 score_launcher.py）两种方式下每增加一个进程的内存成本
+#
+# 用法（在仓库根目录执行，仅支持Linux）：
+#   python -m benchmarks.worker_memory --workers 4 --rows 500000
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.run import REPO_ROOT, RESULT_MARKER
+
+MODES = ["private", "shared"]
+
+
+def smaps_rollup(pid="self"):
+    """返回进程内存统计（MB）：Rss、Pss（共享页按进程数分摊）、Private（仅本进程独占）"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1]) / 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def run_worker(mode, csv_path):
+    """子进程：导入库后记录基线，加载数据和模型，打印增量后等待父进程关闭stdin"""
+    sys.path.insert(0, REPO_ROOT)
+    import pandas as pd
+
+    from score_bundle import load_model_artifacts
+    from score_data import load_student_frame
+    from score_paths import DEFAULT_PATHS, model_paths
+    before = smaps_rollup()
+    if mode == "private":
+        df = pd.read_csv(csv_path, encoding="utf-8-sig", dtype={"学号": str, "性别": "category", "专业": "category"})
+        # 指向不存在的模型包，走旧部署的 joblib 兜底加载
+        paths = dict(DEFAULT_PATHS, bundle_path=".bench_data/不存在的模型包")
+        df = df.dropna()
+    else:
+        df = load_student_frame(csv_path, dropna=True)
+        paths = DEFAULT_PATHS
+    bundle = load_model_artifacts(*(os.path.join(REPO_ROOT, path) for path in model_paths(paths)))
+    # 触达全部数据页，模拟页面和预测已经运行过
+    df.select_dtypes(include="number").sum()
+    for array in bundle.model.arrays().values():
+        array.sum()
+    print(RESULT_MARKER + json.dumps({"pid": os.getpid(), "before": before}), flush=True)
+    sys.stdin.read()
+
+
+def measure(mode, csv_path, n_workers):
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.worker_memory", "--worker", mode, "--csv", csv_path],
+            cwd=REPO_ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+        for _ in range(n_workers)
+    ]
+    try:
+        starts = []
+        for proc in procs:
+            for line in proc.stdout:
+                if line.startswith(RESULT_MARKER):
+                    starts.append(json.loads(line[len(RESULT_MARKER):]))
+                    break
+            else:
+                raise RuntimeError(f"工作进程 {proc.pid} 未完成加载")
+        # 全部进程都加载完后再读取，此时共享页已按进程数分摊
+        stats = []
+        for start in starts:
+            now = smaps_rollup(start["pid"])
+            stats.append({key: now[key] - start["before"][key] for key in now})
+    finally:
+        for proc in procs:
+            proc.stdin.close()
+            proc.wait()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多工作进程加载数据与模型的内存报告")
+    parser.add_argument("--workers", type=int, default=4, help="同时运行的进程数")
+    parser.add_argument("--rows", type=int, default=500_000, help="合成数据的行数")
+    parser.add_argument("--csv", help="直接使用指定CSV（忽略 --rows）")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.csv)
+        return
+    if args.csv:
+        csv_path = os.path.abspath(args.csv)
+    else:
+        from benchmarks.datasets import synthetic_csv
+        csv_path = os.path.abspath(synthetic_csv(args.rows, data_dir=os.path.join(REPO_ROOT, ".bench_data")))
+    # 先生成共享缓存，不把转换计入任何一个工作进程
+    sys.path.insert(0, REPO_ROOT)
+    from score_data import load_student_table
+    load_student_table(csv_path)
+
+    print(f"{csv_path}，{args.workers}个进程（各进程加载数据与模型后的内存增量，MB）")
+    print(f"{'方式':<10}{'RSS/进程':>12}{'PSS/进程':>12}{'私有/进程':>12}{'PSS合计':>12}")
+    for mode in MODES:
+        stats = measure(mode, csv_path, args.workers)
+        mean = {key: sum(s[key] for s in stats) / len(stats) for key in stats[0]}
+        total_pss = sum(s["pss"] for s in stats)
+        print(f"{mode:<10}{mean['rss']:12.1f}{mean['pss']:12.1f}{mean['private']:12.1f}{total_pss:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# 训练后的森林压缩：剔除冗余树、合并相同叶子、float32阈值与窄索引类型，可选蒸馏为更小的森林
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+
+from score_forest import FlatForest, _float32_floor
+
+
+# -------------------------- 1. 剔除冗余树（贪心前向选择，逼近完整森林的输出） --------------------------
+def select_trees(forest, X_val, max_deviation=0.2, min_trees=5):
+    """贪心地逐棵加入能让子森林最贴近完整森林预测的树，直到平均偏差不超过 max_deviation 分
+
+    以完整森林的输出为目标而不是真实成绩，避免在验证集上过拟合；返回选中树的下标（按加入顺序）。
+    """
+    leaves = forest.leaf_values(X_val).astype(np.float64)
+    reference = leaves.mean(axis=1)
+
+    chosen = []
+    remaining = np.ones(leaves.shape[1], dtype=bool)
+    running_sum = np.zeros(len(reference))
+    while remaining.any():
+        k = len(chosen) + 1
+        # 一次性计算所有剩余候选加入后的偏差
+        trial = (running_sum[:, None] + leaves[:, remaining]) / k
+        deviations = np.abs(trial - reference[:, None]).mean(axis=0)
+        best = np.flatnonzero(remaining)[np.argmin(deviations)]
+        chosen.append(int(best))
+        remaining[best] = False
+        running_sum += leaves[:, best]
+        if k >= min_trees and deviations.min() <= max_deviation:
+            break
+    return chosen
+
+
+# -------------------------- 2. 逐树重建：合并相同叶子 + 只保留可达节点 --------------------------
+def _compact_tree(feature, threshold, children, value, start, end):
+    # 节点下标（相对本树）：sklearn 按深度优先编号，子节点编号总大于父节点，倒序遍历即可自底向上合并
+    n = end - start
+    feat = feature[start:end]
+    thr = threshold[start:end]
+    left = children[start:end, 0] - start
+    right = children[start:end, 1] - start
+    val = value[start:end].astype(np.float32)
+    is_leaf = left == np.arange(n)
+    for node in range(n - 1, -1, -1):
+        if not is_leaf[node] and is_leaf[left[node]] and is_leaf[right[node]] and val[left[node]] == val[right[node]]:
+            is_leaf[node] = True
+            val[node] = val[left[node]]
+
+    # 从根开始深度优先重新编号，丢弃被合并掉的子树
+    order, depth_of, new_id = [], {0: 0}, {}
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        new_id[node] = len(order)
+        order.append(node)
+        if not is_leaf[node]:
+            stack.append(right[node])
+            stack.append(left[node])
+            depth_of[left[node]] = depth_of[right[node]] = depth_of[node] + 1
+    order = np.asarray(order)
+    kept_leaf = is_leaf[order]
+    new_left = np.array([new_id[left[o]] if not is_leaf[o] else i for i, o in enumerate(order)])
+    new_right = np.array([new_id[right[o]] if not is_leaf[o] else i for i, o in enumerate(order)])
+    return (
+        np.where(kept_leaf, 0, feat[order]),
+        np.where(kept_leaf, np.inf, thr[order]),
+        np.stack([new_left, new_right], axis=1),
+        val[order],
+        max(depth_of.values()),
+    )
+
+
+def rebuild(forest, tree_ids=None):
+    """按给定树下标重建森林：合并相同叶子、阈值/输出转float32、索引使用能容纳的最窄类型"""
+    ranges = forest.tree_ranges()
+    tree_ids = range(len(ranges)) if tree_ids is None else tree_ids
+    features, thresholds, children, values, roots = [], [], [], [], []
+    offset = 0
+    depth = 0
+    for t in tree_ids:
+        start, end = ranges[t]
+        f, thr, ch, val, d = _compact_tree(
+            forest.feature, forest.threshold, forest.children, forest.value, start, end
+        )
+        features.append(f)
+        thresholds.append(thr)
+        children.append(ch + offset)
+        values.append(val)
+        roots.append(offset)
+        depth = max(depth, d)
+        offset += len(val)
+
+    index_type = np.uint16 if offset <= np.iinfo(np.uint16).max else np.int32
+    feature_type = np.uint8 if forest.n_features <= np.iinfo(np.uint8).max else np.int32
+    return FlatForest(
+        feature=np.concatenate(features).astype(feature_type),
+        threshold=_float32_floor(np.concatenate(thresholds).astype(np.float64)),
+        children=np.concatenate(children).astype(index_type),
+        value=np.concatenate(values).astype(np.float32),
+        roots=np.asarray(roots, dtype=np.int32),
+        depth=depth,
+        feature_names=forest.feature_names,
+    )
+
+
+# -------------------------- 3. 可选：蒸馏为更小的森林 --------------------------
+def distill(forest, X, n_estimators=30, max_depth=10, min_samples_leaf=5, random_state=42):
+    """用原森林在X上的预测作为标签，训练一个更小的森林并扁平化"""
+    X = np.asarray(X, dtype=np.float64)
+    student = RandomForestRegressor(
+        n_estimators=n_estimators, max_depth=max_depth, min_samples_leaf=min_samples_leaf,
+        random_state=random_state, n_jobs=-1,
+    )
+    student.fit(X, forest.predict(X))
+    return FlatForest.from_sklearn(student, forest.feature_names)
+
+
+# -------------------------- 4. 压缩效果报告 --------------------------
+def _latency_us(forest, X, repeat=200):
+    rows = np.asarray(X, dtype=np.float64)[:repeat]
+    start = time.perf_counter()
+    for row in rows:
+        forest.predict(row.reshape(1, -1))
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+
+def compare(original, compacted, X_test, y_test):
+    """对比压缩前后的精度、体积和单条预测延迟"""
+    report = {}
+    for name, forest in (("原始", original), ("压缩后", compacted)):
+        y_pred = forest.predict(X_test)
+        report[name] = {
+            "trees": forest.n_trees,
+            "nodes": len(forest.value),
+            "size_mb": forest.nbytes / 1024 / 1024,
+            "latency_us": _latency_us(forest, X_test),
+            "mae": mean_absolute_error(y_test, y_pred),
+            "r2": r2_score(y_test, y_pred),
+        }
+    return report
+
+
+def compact_forest(forest, X_val, max_deviation=0.2, distill_trees=None, X_distill=None, distill_depth=10):
+    """完整压缩流程：可选蒸馏 → 剔除冗余树 → 合并叶子与窄类型"""
+    if distill_trees:
+        forest = distill(forest, X_distill, n_estimators=distill_trees, max_depth=distill_depth)
+    tree_ids = select_trees(forest, X_val, max_deviation=max_deviation)
+    return rebuild(forest, tree_ids)
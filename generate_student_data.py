@@ -0,0 +1,187 @@
+# 合成学生成绩数据生成器：从真实CSV学习（专业, 性别）分布、各数值列的分组分布和列间相关性，
+# 分块、多进程生成任意规模的数据集，列名与编码与 student_data_adjusted_rounded.csv 一致
+#
+# 用法：python generate_student_data.py --rows 10000000 --out students_10m.csv [--format parquet]
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from scipy.special import ndtr, ndtri
+
+from score_data import load_student_frame
+
+GROUP_KEYS = ["专业", "性别"]
+N_QUANTILES = 1001
+
+
+# -------------------------- 1. 学习数据分布 --------------------------
+def learn_profile(csv_path, n_quantiles=N_QUANTILES):
+    """返回可JSON序列化的分布描述
+
+    - groups / group_probs：（专业, 性别）组合及其占比
+    - quantiles：每个组合下各数值列的分位数表（逆经验分布函数）
+    - corr_cholesky：各数值列正态分数相关矩阵的Cholesky分解（高斯Copula，保留列间相关性）
+    """
+    df = load_student_frame(csv_path, dropna=True)
+    numeric_cols = df.select_dtypes(include="floating").columns.tolist()
+    grid = np.linspace(0, 1, n_quantiles)
+
+    grouped = df.groupby(GROUP_KEYS, observed=True)
+    groups, probs, quantiles = [], [], []
+    for key, part in grouped:
+        groups.append([str(k) for k in key])
+        probs.append(len(part) / len(df))
+        quantiles.append({col: np.quantile(part[col].to_numpy(dtype=np.float64), grid).tolist() for col in numeric_cols})
+
+    # 正态分数：秩 → 均匀分布 → 标准正态
+    ranks = df[numeric_cols].rank(method="average").to_numpy()
+    scores = ndtri((ranks - 0.5) / len(df))
+    corr = np.corrcoef(scores, rowvar=False)
+    cholesky = np.linalg.cholesky(corr + np.eye(len(numeric_cols)) * 1e-9)
+
+    ids = df["学号"].astype("int64")
+    return {
+        "columns": df.columns.tolist(),
+        "numeric_columns": numeric_cols,
+        "groups": groups,
+        "group_probs": probs,
+        "quantile_grid": grid.tolist(),
+        "quantiles": quantiles,
+        "corr_cholesky": cholesky.tolist(),
+        "first_id": int(ids.min()),
+        "decimals": 2,
+    }
+
+
+# -------------------------- 2. 分块生成 --------------------------
+def generate_chunk(profile, n_rows, seed, start_offset=0):
+    """生成一个数据块（pyarrow.Table）；seed 不同的块互相独立，可并行生成"""
+    rng = np.random.default_rng(seed)
+    numeric_cols = profile["numeric_columns"]
+    grid = np.asarray(profile["quantile_grid"])
+    cholesky = np.asarray(profile["corr_cholesky"])
+
+    # 先按组合占比抽出各组行数，在“按组排好序”的布局里连续计算（避免逐组布尔掩码），
+    # 最后用一个随机排列把行打散
+    counts = rng.multinomial(n_rows, np.asarray(profile["group_probs"]))
+    uniforms = ndtr(rng.standard_normal((n_rows, len(numeric_cols))) @ cholesky.T)
+    sorted_values = np.empty((n_rows, len(numeric_cols)))
+    start = 0
+    for g, table in enumerate(profile["quantiles"]):
+        end = start + counts[g]
+        for j, col in enumerate(numeric_cols):
+            sorted_values[start:end, j] = np.interp(uniforms[start:end, j], grid, table[col])
+        start = end
+    perm = rng.permutation(n_rows)
+    values = np.empty_like(sorted_values)
+    values[perm] = sorted_values.round(profile["decimals"])
+    group_ids = np.empty(n_rows, dtype=np.int32)
+    group_ids[perm] = np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+
+    # 分类列用字典编码构造，再由Arrow转换为字符串，比逐个生成Python字符串快得多
+    def category_column(position):
+        labels = sorted({g[position] for g in profile["groups"]})
+        codes = np.asarray([labels.index(g[position]) for g in profile["groups"]], dtype=np.int32)
+        return pa.DictionaryArray.from_arrays(codes[group_ids], labels).cast(pa.string())
+
+    ids = profile["first_id"] + start_offset + np.arange(n_rows, dtype=np.int64)
+    columns = {
+        "学号": pa.array(ids).cast(pa.string()),
+        "性别": category_column(1),
+        "专业": category_column(0),
+    }
+    for j, col in enumerate(numeric_cols):
+        columns[col] = pa.array(values[:, j])
+    return pa.table({col: columns[col] for col in profile["columns"]})
+
+
+def _chunk_job(args):
+    # 进程池任务：生成一块并在worker内完成CSV序列化，主进程只负责按顺序写出
+    profile, n_rows, seed, start_offset, fmt = args
+    table = generate_chunk(profile, n_rows, seed, start_offset)
+    if fmt == "parquet":
+        return table
+    sink = pa.BufferOutputStream()
+    # 取值中没有逗号和引号，不加引号，与原始CSV格式一致；表头由主进程统一写出
+    pa_csv.write_csv(table, sink, pa_csv.WriteOptions(include_header=False, quoting_style="none"))
+    return sink.getvalue().to_pybytes()
+
+
+def _ordered_results(pool, jobs, window):
+    # 最多同时有 window 个块在生成或等待写出，按提交顺序逐个返回，内存占用有界
+    pending = deque()
+    for job in jobs:
+        pending.append(pool.submit(_chunk_job, job))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def write_dataset(profile, n_rows, out_path, fmt="csv", chunk_rows=500_000, workers=None, seed=0):
+    """分块并行生成并写出；内存占用约为 2 × workers × chunk_rows 行，与总行数无关"""
+    workers = workers or os.cpu_count() or 1
+    jobs = (
+        (profile, min(chunk_rows, n_rows - start), seed * 1_000_003 + i, start, fmt)
+        for i, start in enumerate(range(0, n_rows, chunk_rows))
+    )
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = _ordered_results(pool, jobs, window=2 * workers)
+        if fmt == "parquet":
+            writer = None
+            for table in results:
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+            if writer is not None:
+                writer.close()
+        else:
+            with open(tmp_path, "wb") as f:
+                # 与原始CSV一致：utf-8 带BOM，表头不加引号
+                f.write(("\ufeff" + ",".join(profile["columns"]) + "\n").encode("utf-8"))
+                for data in results:
+                    f.write(data)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+# -------------------------- 命令行入口 --------------------------
+def main():
+    parser = argparse.ArgumentParser(description="生成与真实数据分布一致的合成学生成绩数据")
+    parser.add_argument("--rows", type=int, required=True, help="生成行数")
+    parser.add_argument("--out", required=True, help="输出文件路径")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="输出格式")
+    parser.add_argument("--source", default="student_data_adjusted_rounded.csv", help="用于学习分布的真实数据")
+    parser.add_argument("--profile", help="分布描述JSON：存在则直接读取，否则学习后写入该路径")
+    parser.add_argument("--chunk-rows", type=int, default=500_000, help="每块行数")
+    parser.add_argument("--workers", type=int, default=None, help="生成进程数（默认CPU核数）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    start = time.time()
+    if args.profile and os.path.exists(args.profile):
+        with open(args.profile, encoding="utf-8") as f:
+            profile = json.load(f)
+    else:
+        profile = learn_profile(args.source)
+        if args.profile:
+            with open(args.profile, "w", encoding="utf-8") as f:
+                json.dump(profile, f, ensure_ascii=False)
+    print(f"分布学习完成（耗时{time.time()-start:.2f}秒）：{len(profile['groups'])}个（专业, 性别）组合")
+
+    gen_start = time.time()
+    write_dataset(profile, args.rows, args.out, fmt=args.format,
+                  chunk_rows=args.chunk_rows, workers=args.workers, seed=args.seed)
+    print(f"已生成 {args.rows} 行 → {args.out}（耗时{time.time()-gen_start:.2f}秒）")
+
+
+if __name__ == "__main__":
+    main()
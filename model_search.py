@@ -0,0 +1,125 @@
+# 随机森林超参数搜索：多进程并行交叉验证，记录精度、训练耗时、预测延迟和模型体积，按预算挑选帕累托最优模型
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import KFold
+
+from score_forest import FlatForest
+
+# 网格搜索的参数空间；随机搜索在同样的取值里抽样
+PARAM_GRID = {
+    "n_estimators": [30, 60, 100, 150],
+    "max_depth": [8, 10, 12],
+    "min_samples_leaf": [5, 10, 20],
+}
+
+# 进程池里每个worker持有一份训练数据，避免每个任务重复传输
+_X = None
+_y = None
+
+
+def _init_worker(X, y):
+    global _X, _y
+    _X, _y = X, y
+
+
+def grid_candidates(grid=PARAM_GRID):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def random_candidates(n_iter, grid=PARAM_GRID, seed=42):
+    all_candidates = grid_candidates(grid)
+    return random.Random(seed).sample(all_candidates, min(n_iter, len(all_candidates)))
+
+
+def _single_row_latency_us(forest, X, repeat=200):
+    # 用扁平化森林测单条预测延迟（与线上推理路径一致），取中位数
+    rows = X[np.random.default_rng(0).integers(0, len(X), repeat)]
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        forest.predict(row.reshape(1, -1))
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1e6)
+
+
+def evaluate_candidate(params, cv=3, random_state=42):
+    """在worker进程中对一组参数做K折交叉验证，返回一条结果记录"""
+    maes, r2s, fit_times = [], [], []
+    model = None
+    for train_idx, valid_idx in KFold(cv, shuffle=True, random_state=random_state).split(_X):
+        model = RandomForestRegressor(random_state=random_state, n_jobs=1, **params)
+        start = time.perf_counter()
+        model.fit(_X[train_idx], _y[train_idx])
+        fit_times.append(time.perf_counter() - start)
+        y_pred = model.predict(_X[valid_idx])
+        maes.append(mean_absolute_error(_y[valid_idx], y_pred))
+        r2s.append(r2_score(_y[valid_idx], y_pred))
+
+    forest = FlatForest.from_sklearn(model, feature_names=[f"f{i}" for i in range(_X.shape[1])])
+    return dict(
+        params,
+        mae=float(np.mean(maes)),
+        r2=float(np.mean(r2s)),
+        fit_seconds=float(np.mean(fit_times)),
+        latency_us=_single_row_latency_us(forest, _X),
+        size_mb=forest.nbytes / 1024 / 1024,
+    )
+
+
+def run_search(X, y, candidates, cv=3, workers=None):
+    """并行评估全部候选参数，返回结果记录列表（按完成顺序）"""
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    workers = workers or os.cpu_count() or 1
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(X, y)) as pool:
+        futures = [pool.submit(evaluate_candidate, params, cv) for params in candidates]
+        for future in as_completed(futures):
+            result = future.result()
+            print(f"  {result}")
+            results.append(result)
+    return results
+
+
+def pareto_front(results, objectives=("mae", "latency_us", "size_mb")):
+    """三个目标都越小越好；返回不被任何其他候选支配的结果"""
+    front = []
+    for a in results:
+        dominated = any(
+            all(b[k] <= a[k] for k in objectives) and any(b[k] < a[k] for k in objectives)
+            for b in results
+        )
+        if not dominated:
+            front.append(a)
+    return front
+
+
+def select_model(results, mae_tolerance=0.02, latency_budget_us=None, size_budget_mb=None):
+    """在帕累托前沿中挑选满足预算、且MAE不超过最优值(1+容差)的最小、最快模型
+
+    没有候选满足预算，或满足预算的候选MAE都超出容差时抛出 ValueError（不会悄悄选出精度不达标的模型）。
+    """
+    candidates = [
+        r for r in pareto_front(results)
+        if (latency_budget_us is None or r["latency_us"] <= latency_budget_us)
+        and (size_budget_mb is None or r["size_mb"] <= size_budget_mb)
+    ]
+    if not candidates:
+        raise ValueError("没有候选模型满足延迟/体积预算，请放宽预算或扩大搜索范围")
+    best_mae = min(r["mae"] for r in results)
+    accurate = [r for r in candidates if r["mae"] <= best_mae * (1 + mae_tolerance)]
+    if not accurate:
+        closest = min(r["mae"] for r in candidates)
+        raise ValueError(
+            f"满足延迟/体积预算的候选模型MAE最低为{closest:.3f}，超出最优MAE {best_mae:.3f} 的 {mae_tolerance:.0%} 容差，"
+            f"请放宽预算或增大 --mae-tolerance"
+        )
+    return min(accurate, key=lambda r: (r["size_mb"], r["latency_us"], r["mae"]))
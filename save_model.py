@@ -1,65 +1,194 @@
+import argparse
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_absolute_error
 from sklearn.model_selection import train_test_split
-import pickle
-from joblib import dump  # 新增joblib导入
 import time
+from score_forest import FlatForest
+from score_bundle import save_bundle
+from score_paths import DEFAULT_PATHS
+from model_search import grid_candidates, random_candidates, run_search, pareto_front, select_model
+from stream_train import stream_fit
+from forest_compact import compact_forest, compare
 
-# 1. 数据加载与预处理（完全保留你的逻辑）
-start_time = time.time()
-df = pd.read_csv(
-    'student_data_adjusted_rounded.csv',
-    encoding='utf-8-sig',
-    dtype={
-        '学号': str,          
-        '性别': 'category',  
-        '专业': 'category'
-    }
-)
-df.dropna(inplace=True)
-print(f"数据集形状：{df.shape}（耗时{time.time()-start_time:.2f}秒）")
-print("特征列：", df.columns.tolist())
-
-# 2. 定义特征和目标变量（完全保留）
-features = df[['性别', '专业', '每周学习时长（小时）', '上课出勤率', '期中考试分数', '作业完成率']]
-target = df['期末考试分数']
-
-# 3. 分类特征编码（完全保留）
-features_encoded = pd.get_dummies(features, drop_first=False)
-print("编码后的特征列数：", len(features_encoded.columns.tolist()))
-
-# 4. 划分训练集（完全保留）
-x_train, x_test, y_train, y_test = train_test_split(
-    features_encoded, target, train_size=0.8, random_state=42, shuffle=True
-)
-
-# 5. 模型训练（完全保留你的参数）
-rfr = RandomForestRegressor(
-    n_estimators=150,    
-    random_state=42,
-    n_jobs=-1,           
-    max_depth=12,        
-    min_samples_leaf=5   
-)
-train_start = time.time()
-rfr.fit(x_train, y_train)
-print(f"模型训练完成（耗时{time.time()-train_start:.2f}秒）")
-
-# 6. 模型评估（完全保留）
-y_pred = rfr.predict(x_test)
-print(f"模型评估结果：")
-print(f"决定系数（R²）：{r2_score(y_test, y_pred):.4f}")
-print(f"平均绝对误差（MAE）：{mean_absolute_error(y_test, y_pred):.2f}分")
-
-# 7. 保存模型（仅改模型为joblib保存，其余配置文件仍用pickle）
-dump(rfr, 'rfr_model.joblib', compress=3)  # 替换pickle.dump为joblib.dump（压缩减小体积）
-with open('feature_names.pkl', 'wb') as f:
-    pickle.dump(features_encoded.columns.tolist(), f)
-with open('unique_values.pkl', 'wb') as f:
-    pickle.dump({
-        '性别': df['性别'].unique().tolist(),
-        '专业': df['专业'].unique().tolist()
-    }, f)
-
-print(f"全部流程完成（总耗时{time.time()-start_time:.2f}秒）")
+# 默认模型参数（不做搜索时使用）
+DEFAULT_PARAMS = {
+    "n_estimators": 150,
+    "max_depth": 12,
+    "min_samples_leaf": 5
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="训练期末成绩预测模型并保存模型包")
+    parser.add_argument("--csv", default=DEFAULT_PATHS["csv_path"], help="训练数据CSV路径")
+    parser.add_argument("--stream", action="store_true", help="分块训练（数据集大于内存时使用）")
+    parser.add_argument("--chunksize", type=int, default=200_000, help="分块训练每块行数")
+    parser.add_argument("--search", choices=["grid", "random"], help="先做超参数搜索，再用选出的参数训练")
+    parser.add_argument("--n-iter", type=int, default=12, help="随机搜索的候选数量")
+    parser.add_argument("--cv", type=int, default=3, help="交叉验证折数")
+    parser.add_argument("--workers", type=int, default=None, help="搜索进程数（默认CPU核数）")
+    parser.add_argument("--mae-tolerance", type=float, default=0.02, help="允许比最优MAE差的比例")
+    parser.add_argument("--latency-budget-us", type=float, default=None, help="单条预测延迟预算（微秒）")
+    parser.add_argument("--size-budget-mb", type=float, default=None, help="模型体积预算（MB）")
+    parser.add_argument("--compact", action="store_true", help="训练后压缩森林（剔除冗余树、float32阈值、窄索引）")
+    parser.add_argument("--max-deviation", type=float, default=0.2, help="压缩后与原森林预测的平均偏差上限（分）")
+    parser.add_argument("--distill-trees", type=int, default=None, help="先蒸馏为指定棵数的小森林再压缩")
+    parser.add_argument("--distill-depth", type=int, default=10, help="蒸馏森林的最大深度")
+    return parser.parse_args()
+
+
+def compact_stage(flat_forest, args, x_val, x_test, y_test, x_distill=None):
+    # 压缩森林并报告精度变化；x_val 只用于挑选树（以原森林输出为目标，不需要真实成绩）
+    compacted = compact_forest(
+        flat_forest,
+        x_val,
+        max_deviation=args.max_deviation,
+        distill_trees=args.distill_trees,
+        X_distill=x_distill,
+        distill_depth=args.distill_depth
+    )
+    report = pd.DataFrame(compare(flat_forest, compacted, x_test, y_test)).T
+    print("森林压缩结果：")
+    print(report.round(4).to_string())
+    print(f"MAE变化：{report.loc['压缩后', 'mae'] - report.loc['原始', 'mae']:+.3f}分，"
+          f"R²变化：{report.loc['压缩后', 'r2'] - report.loc['原始', 'r2']:+.4f}")
+    return compacted
+
+
+def save_model_bundle(flat_forest, unique_values, params):
+    # 保存模型包（扁平化森林数组 + 特征名 + 类别取值 + 内容哈希，单文件不压缩，可内存映射加载）
+    content_hash = save_bundle(
+        DEFAULT_PATHS["bundle_path"],
+        flat_forest,
+        unique_values=unique_values,
+        extra_meta={"params": params}
+    )
+    print(f"模型包已保存：{len(flat_forest.roots)}棵树，{len(flat_forest.value)}个节点，内容哈希{content_hash}")
+
+
+def main_stream(args):
+    # 分块训练：内存峰值由 --chunksize 决定，与数据集大小无关
+    start_time = time.time()
+    params = dict(DEFAULT_PARAMS)
+    rfr, feature_names, unique_values, x_test, y_test = stream_fit(
+        args.csv, chunksize=args.chunksize, **params
+    )
+    print(f"模型训练完成（耗时{time.time()-start_time:.2f}秒）")
+
+    y_pred = rfr.predict(x_test)
+    print(f"模型评估结果（留出{len(y_test)}行）：")
+    print(f"决定系数（R²）：{r2_score(y_test, y_pred):.4f}")
+    print(f"平均绝对误差（MAE）：{mean_absolute_error(y_test, y_pred):.2f}分")
+
+    flat_forest = FlatForest.from_sklearn(rfr, feature_names)
+    if args.compact:
+        # 分块模式没有常驻内存的训练集：留出集前一半用于挑树/蒸馏，后一半用于精度对比
+        half = len(y_test) // 2
+        flat_forest = compact_stage(
+            flat_forest, args, x_test[:half], x_test[half:], y_test[half:], x_distill=x_test[:half]
+        )
+    save_model_bundle(flat_forest, unique_values, dict(params, n_estimators=rfr.n_estimators))
+    print(f"全部流程完成（总耗时{time.time()-start_time:.2f}秒）")
+
+
+def main():
+    args = parse_args()
+    if args.stream:
+        return main_stream(args)
+
+    # 1. 数据加载与预处理（完全保留你的逻辑）
+    start_time = time.time()
+    df = pd.read_csv(
+        args.csv,
+        encoding='utf-8-sig',
+        dtype={
+            '学号': str,
+            '性别': 'category',
+            '专业': 'category'
+        }
+    )
+    df.dropna(inplace=True)
+    print(f"数据集形状：{df.shape}（耗时{time.time()-start_time:.2f}秒）")
+    print("特征列：", df.columns.tolist())
+
+    # 2. 定义特征和目标变量（完全保留）
+    features = df[['性别', '专业', '每周学习时长（小时）', '上课出勤率', '期中考试分数', '作业完成率']]
+    target = df['期末考试分数']
+
+    # 3. 分类特征编码（完全保留）
+    features_encoded = pd.get_dummies(features, drop_first=False)
+    print("编码后的特征列数：", len(features_encoded.columns.tolist()))
+
+    # 4. 划分训练集（完全保留）
+    x_train, x_test, y_train, y_test = train_test_split(
+        features_encoded, target, train_size=0.8, random_state=42, shuffle=True
+    )
+
+    # 4.1 超参数搜索（可选）：在训练集上并行交叉验证，按预算选出帕累托最优参数
+    params = dict(DEFAULT_PARAMS)
+    if args.search:
+        if args.search == "grid":
+            candidates = grid_candidates()
+        else:
+            candidates = random_candidates(args.n_iter)
+        print(f"开始超参数搜索：{len(candidates)}组候选，{args.cv}折交叉验证")
+        search_start = time.time()
+        results = run_search(x_train, y_train, candidates, cv=args.cv, workers=args.workers)
+        pd.DataFrame(results).to_csv("model_search_results.csv", index=False, encoding="utf-8-sig")
+        print(f"搜索完成（耗时{time.time()-search_start:.2f}秒），帕累托前沿：")
+        print(pd.DataFrame(pareto_front(results)).sort_values("mae").to_string(index=False))
+        try:
+            best = select_model(
+                results,
+                mae_tolerance=args.mae_tolerance,
+                latency_budget_us=args.latency_budget_us,
+                size_budget_mb=args.size_budget_mb
+            )
+        except ValueError as e:
+            raise SystemExit(str(e))
+        params = {key: best[key] for key in DEFAULT_PARAMS}
+        print(f"选中参数：{params}（交叉验证MAE {best['mae']:.2f}，延迟{best['latency_us']:.0f}µs，体积{best['size_mb']:.1f}MB）")
+
+    # 5. 模型训练
+    rfr = RandomForestRegressor(
+        random_state=42,
+        n_jobs=-1,
+        **params
+    )
+    train_start = time.time()
+    rfr.fit(x_train, y_train)
+    print(f"模型训练完成（耗时{time.time()-train_start:.2f}秒）")
+
+    # 6. 模型评估（完全保留）
+    y_pred = rfr.predict(x_test)
+    print(f"模型评估结果：")
+    print(f"决定系数（R²）：{r2_score(y_test, y_pred):.4f}")
+    print(f"平均绝对误差（MAE）：{mean_absolute_error(y_test, y_pred):.2f}分")
+
+    # 6.1 森林压缩（可选）：挑树用训练集样本，精度对比用测试集；蒸馏用训练集作为输入
+    flat_forest = FlatForest.from_sklearn(rfr, features_encoded.columns.tolist())
+    if args.compact:
+        x_train_values = x_train.to_numpy(dtype=np.float64)
+        flat_forest = compact_stage(
+            flat_forest, args, x_train_values[:5000], x_test.to_numpy(dtype=np.float64), y_test,
+            x_distill=x_train_values
+        )
+
+    # 7. 保存模型包
+    save_model_bundle(
+        flat_forest,
+        unique_values={
+            '性别': df['性别'].unique().tolist(),
+            '专业': df['专业'].unique().tolist()
+        },
+        params=params
+    )
+
+    print(f"全部流程完成（总耗时{time.time()-start_time:.2f}秒）")
+
+
+# 搜索模式使用多进程，入口必须放在 __main__ 保护下（Windows 下子进程会重新导入本文件）
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+# 预测审计日志：每次预测的输入、学号、模型版本和输出先写入内存缓冲，由后台线程按批追加到
+# 按时间轮转的 Arrow IPC 流文件（列式存储），每批写完即 fsync，进程崩溃最多丢失一个刷新间隔的记录
+#
+# 目录布局：<目录>/<年-月>/audit-<开始时间>-<进程号>-<序号>.arrows
+# 读取：read_audit(目录, start, end) 按文件名中的开始时间跳过无关文件，多线程内存映射读取；
+# 时间一律为本地时间（不带时区）
+#
+# 用法：python score_audit.py --dir audit_logs --start 2026-09-01 --end 2026-10-01 [--student 2023001]
+import argparse
+import atexit
+import glob
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+
+logger = logging.getLogger(__name__)
+
+AUDIT_SCHEMA = pa.schema([
+    ("时间", pa.timestamp("ms")),
+    ("学号", pa.string()),
+    ("模型版本", pa.string()),
+    ("性别", pa.string()),
+    ("专业", pa.string()),
+    ("每周学习时长（小时）", pa.float64()),
+    ("上课出勤率", pa.float64()),
+    ("期中考试分数", pa.float64()),
+    ("作业完成率", pa.float64()),
+    ("预测期末成绩", pa.float64()),
+])
+AUDIT_COLUMNS = AUDIT_SCHEMA.names
+# 单个文件最长覆盖的时间；读取时据此判断文件是否可能包含查询区间内的记录
+ROTATE_SECONDS = 3600
+_TIME_FORMAT = "%Y%m%d-%H%M%S"
+
+
+def _coerce_row(fields):
+    """按 AUDIT_SCHEMA 把一条记录规整为元组：字符串列转为str（如整数学号），数值列转为float，
+    “时间”默认为当前本地时间；无法转换时抛出 ValueError/TypeError"""
+    row = []
+    for field in AUDIT_SCHEMA:
+        value = fields.get(field.name)
+        if value is None:
+            if field.name == "时间":
+                value = datetime.now()
+        elif pa.types.is_timestamp(field.type):
+            if not isinstance(value, datetime):
+                raise TypeError(f"“{field.name}”应为datetime，实际为{type(value).__name__}")
+        elif pa.types.is_string(field.type):
+            value = str(value)
+        else:
+            value = float(value)
+        row.append(value)
+    return tuple(row)
+
+
+class AuditLog:
+    """缓冲 + 后台批量刷新的追加式审计日志（线程安全，Streamlit各会话共享一个实例）
+
+    - 每 flush_interval 秒或缓冲达到 max_buffer 条时刷新一次，每次刷新写一个 record batch 并 fsync
+    - 缓冲已满而后台尚未写完时 record() 最多阻塞 record_timeout 秒，内存占用有上界
+    - 记录在 record() 中按列类型规整，无法规整的记录直接丢弃，不会进入缓冲影响其他记录
+    - 写盘失败时记录日志，未写入的记录放回缓冲下次重试；缓冲放不下或等待超时、后台线程已退出、
+      日志已关闭时丢弃记录并计入 dropped，不阻塞预测
+    - 文件写满 rotate_rows 行或覆盖 ROTATE_SECONDS 秒后轮转到新文件
+    """
+
+    def __init__(self, directory, flush_interval=2.0, max_buffer=10_000, rotate_rows=1_000_000,
+                 record_timeout=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.rotate_rows = rotate_rows
+        self.record_timeout = record_timeout
+        self.written = 0
+        self.dropped = 0
+        self.last_error = None
+        self._buffer = []
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._file = None
+        self._writer = None
+        self._file_rows = 0
+        self._file_started = 0.0
+        self._seq = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="AuditLog", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, fields):
+        """追加一条记录（列名→取值的dict，列名见 AUDIT_COLUMNS）；未给出的列记为空，“时间”默认为当前本地时间
+
+        返回是否已放入缓冲；审计日志不可用时丢弃记录并返回False，不影响调用方。
+        """
+        try:
+            row = _coerce_row(fields)
+        except (TypeError, ValueError) as e:
+            logger.warning("审计记录格式错误，已丢弃：%s", e)
+            with self._cond:
+                self.dropped += 1
+            return False
+        deadline = time.monotonic() + self.record_timeout
+        with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return False
+            while len(self._buffer) >= self.max_buffer:
+                remaining = deadline - time.monotonic()
+                # 写盘正在失败或后台线程已退出时不再等待
+                if remaining <= 0 or self.last_error is not None or not self._thread.is_alive():
+                    self.dropped += 1
+                    return False
+                self._cond.notify_all()
+                self._cond.wait(remaining)
+            self._buffer.append(row)
+            if len(self._buffer) >= self.max_buffer:
+                self._cond.notify_all()
+            return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed and len(self._buffer) < self.max_buffer:
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("审计日志写入失败，%s 秒后重试", self.flush_interval)
+                if not closed:
+                    # 失败后固定间隔重试，缓冲满时也不空转
+                    with self._cond:
+                        self._cond.wait(self.flush_interval)
+            if closed:
+                return
+
+    def flush(self):
+        """把缓冲中的记录写入当前文件并落盘；失败时记录放回缓冲（放不下的计入 dropped）后抛出异常"""
+        with self._io_lock:
+            with self._cond:
+                rows, self._buffer = self._buffer, []
+                self._cond.notify_all()
+            if not rows:
+                return
+            # 构造批次不属于可重试的写盘错误：record() 已规整过每条记录，这里仍失败时逐条剔除坏记录
+            batch = self._build_batch(rows)
+            if batch is None:
+                return
+            try:
+                self._writer_for(batch.num_rows).write_batch(batch)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except Exception as e:
+                self._discard_file()
+                with self._cond:
+                    pending = rows + self._buffer
+                    overflow = max(len(pending) - self.max_buffer, 0)
+                    # 放不下时丢弃最旧的记录
+                    self._buffer = pending[overflow:]
+                    self.dropped += overflow
+                    self.last_error = str(e)
+                raise
+            self._file_rows += batch.num_rows
+            self.written += batch.num_rows
+            with self._cond:
+                self.last_error = None
+
+    def _build_batch(self, rows):
+        try:
+            return self._batch_from_rows(rows)
+        except (pa.ArrowException, TypeError, ValueError):
+            pass
+        good = []
+        for row in rows:
+            try:
+                self._batch_from_rows([row])
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                logger.warning("审计记录无法写入，已丢弃：%s", e)
+                with self._cond:
+                    self.dropped += 1
+            else:
+                good.append(row)
+        return self._batch_from_rows(good) if good else None
+
+    @staticmethod
+    def _batch_from_rows(rows):
+        return pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(zip(*rows), AUDIT_SCHEMA)],
+            schema=AUDIT_SCHEMA,
+        )
+
+    def _writer_for(self, n_rows):
+        # 当前文件写满或时间跨度到期时先关闭（写入流结束标记），再在“年-月”子目录下新建文件
+        now = time.time()
+        if self._writer is not None and (
+            self._file_rows + n_rows > self.rotate_rows or now - self._file_started >= ROTATE_SECONDS
+        ):
+            self._close_file()
+        if self._writer is None:
+            started = datetime.fromtimestamp(now)
+            month_dir = os.path.join(self.directory, started.strftime("%Y-%m"))
+            os.makedirs(month_dir, exist_ok=True)
+            self._seq += 1
+            path = os.path.join(month_dir, f"audit-{started.strftime(_TIME_FORMAT)}-{os.getpid()}-{self._seq}.arrows")
+            self._file = open(path, "wb")
+            self._writer = ipc.new_stream(self._file, AUDIT_SCHEMA)
+            self._file_rows = 0
+            self._file_started = now
+        return self._writer
+
+    def _close_file(self):
+        self._writer.close()
+        self._file.close()
+        self._writer = self._file = None
+
+    def _discard_file(self):
+        # 写入失败后当前文件状态未知，关闭（尽力而为）并在下次刷新时新建文件
+        for handle in (self._writer, self._file):
+            if handle is not None:
+                try:
+                    handle.close()
+                except Exception:
+                    pass
+        self._writer = self._file = None
+
+    def close(self):
+        """写完缓冲中剩余的记录并关闭当前文件；可重复调用"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        with self._io_lock:
+            if self._writer is not None:
+                try:
+                    self._close_file()
+                except Exception:
+                    logger.exception("关闭审计日志文件失败")
+                    self._discard_file()
+        with self._cond:
+            # 最后一次刷新也失败了，剩余记录无法落盘
+            self.dropped += len(self._buffer)
+            self._buffer = []
+
+
+# -------------------------- 读取 --------------------------
+def _file_start(path):
+    # audit-<年月日-时分秒>-<进程号>-<序号>.arrows
+    stamp = "-".join(os.path.basename(path).split("-")[1:3])
+    return datetime.strptime(stamp, _TIME_FORMAT)
+
+
+def _read_file(path):
+    # 逐个读取 record batch；进程崩溃留下的文件没有结束标记、末尾可能不完整，读到哪算哪
+    batches = []
+    with pa.memory_map(path) as source:
+        try:
+            reader = ipc.open_stream(source)
+        except pa.ArrowInvalid:
+            return batches
+        while True:
+            try:
+                batches.append(reader.read_next_batch())
+            except StopIteration:
+                break
+            except (pa.ArrowInvalid, OSError):
+                break
+    return batches
+
+
+def audit_files(directory, start=None, end=None, rotate_seconds=ROTATE_SECONDS):
+    """列出可能包含 [start, end) 内记录的日志文件（按开始时间排序）"""
+    paths = glob.glob(os.path.join(directory, "*", "audit-*.arrows"))
+    selected = []
+    for path in paths:
+        began = _file_start(path)
+        if end is not None and began >= end:
+            continue
+        if start is not None and began.timestamp() + rotate_seconds < start.timestamp():
+            continue
+        selected.append((began, path))
+    return [path for _, path in sorted(selected)]
+
+
+def read_audit(directory, start=None, end=None, columns=None, workers=8):
+    """读取 [start, end) 时间区间内的审计记录，返回 pyarrow.Table（columns 指定只取部分列）"""
+    paths = audit_files(directory, start, end)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batches = [batch for file_batches in pool.map(_read_file, paths) for batch in file_batches]
+    table = pa.Table.from_batches(batches, schema=AUDIT_SCHEMA)
+    if start is not None:
+        table = table.filter(pc.greater_equal(table["时间"], pa.scalar(start, pa.timestamp("ms"))))
+    if end is not None:
+        table = table.filter(pc.less(table["时间"], pa.scalar(end, pa.timestamp("ms"))))
+    return table.select(columns) if columns else table
+
+
+# -------------------------- 命令行入口 --------------------------
+def main():
+    parser = argparse.ArgumentParser(description="查询预测审计日志")
+    parser.add_argument("--dir", default="audit_logs", help="审计日志目录")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="开始时间（含），如 2026-09-01")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="结束时间（不含）")
+    parser.add_argument("--student", help="只看指定学号")
+    args = parser.parse_args()
+
+    begin = time.perf_counter()
+    table = read_audit(args.dir, args.start, args.end)
+    if args.student:
+        table = table.filter(pc.equal(table["学号"], args.student))
+    elapsed = time.perf_counter() - begin
+    print(f"共 {table.num_rows} 条记录（读取耗时{elapsed:.2f}秒）")
+    if table.num_rows:
+        print(table.to_pandas().tail(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
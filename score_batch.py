@@ -0,0 +1,55 @@
+# 期末成绩批量预测：分块读取上传的学生名单，逐块向量化编码并调用 model.predict
+import codecs
+import io
+
+import pandas as pd
+
+from score_data import sniff_encoding
+from score_features import INPUT_COLUMNS, encode_features, missing_columns
+
+RESULT_COLUMN = "预测期末成绩"
+LOWER_COLUMN = "预测下限"
+UPPER_COLUMN = "预测上限"
+
+
+def count_rows(raw_bytes):
+    """上传文件已在内存中，数换行符即可得到数据行数，用于进度条"""
+    lines = raw_bytes.count(b"\n") + (0 if raw_bytes.endswith(b"\n") else 1)
+    return max(lines - 1, 0)
+
+
+def predict_csv_in_chunks(raw_bytes, model, feature_names, chunksize=10000):
+    """逐块预测，每处理完一块就 yield (已处理行数, 结果块)
+
+    结果块为原始列加上“预测期末成绩”及80%预测区间的“预测下限”“预测上限”列（同一次遍历得到）；
+    输入列有缺失的行预测值留空。
+    缺少必要列时抛出 ValueError。
+    """
+    encoding = sniff_encoding(raw_bytes[:1 << 16])
+    reader = pd.read_csv(
+        io.BytesIO(raw_bytes),
+        encoding="utf-8-sig" if encoding == "utf-8" else encoding,
+        dtype={"学号": str},
+        chunksize=chunksize,
+    )
+    done = 0
+    for chunk in reader:
+        missing = missing_columns(chunk)
+        if missing:
+            raise ValueError(f"上传文件缺少必要列：{'、'.join(missing)}")
+        valid = chunk.dropna(subset=INPUT_COLUMNS)
+        result_columns = [RESULT_COLUMN, LOWER_COLUMN, UPPER_COLUMN]
+        chunk[result_columns] = float("nan")
+        if len(valid):
+            chunk.loc[valid.index, result_columns] = model.predict_interval(
+                encode_features(valid, feature_names)
+            ).round(1)
+        done += len(chunk)
+        yield done, chunk
+
+
+def write_result_chunk(buffer, result, first):
+    """把结果块追加写入字节缓冲区（首块带BOM和表头，便于Excel直接打开）"""
+    if first:
+        buffer.write(codecs.BOM_UTF8)
+    buffer.write(result.to_csv(index=False, header=first).encode("utf-8"))
@@ -0,0 +1,107 @@
+# 预测请求微批合并：把并发到达的单条预测请求在一个很短的时间窗口内攒成一个矩阵，一次调用模型，
+# 再把结果分发回各自的调用方；推理服务（score_server.py）和 Streamlit 应用的跨会话预测共用
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    """后台线程攒批：第一条请求到达后最多再等 max_wait_ms 毫秒或攒满 max_batch 条就执行一次预测
+
+    max_wait_ms=0 时不额外等待，只合并模型计算期间已经排队的请求。单条请求的等待时间不超过
+    max_wait_ms 加上一批（最多 max_batch 行）的推理时间。
+    """
+
+    def __init__(self, predict_fn, max_batch=256, max_wait_ms=5.0):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="MicroBatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, vector, predict_fn=None):
+        """提交一个已编码的特征向量，返回 concurrent.futures.Future
+
+        结果为 predict_fn 输出中对应的一行：一维输出时是一个数，二维输出（如预测值+区间）时是一个数组。
+        predict_fn 为None时使用构造时给出的函数；调用方也可以指定自己的函数（如固定在某个模型版本上），
+        同一批里指定了不同函数的请求分组后各自预测。
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher 已关闭")
+        future = Future()
+        self._queue.put((np.asarray(vector, dtype=np.float64), future, predict_fn or self.predict_fn))
+        return future
+
+    def predict(self, vector, timeout=None, predict_fn=None):
+        """阻塞版本：提交并等待结果"""
+        return self.submit(vector, predict_fn).result(timeout)
+
+    def predict_rows(self, X, timeout=None, predict_fn=None):
+        """与 model.predict 相同的接口：逐行提交后等待，各行可能与其他调用方的请求合并在同一批里"""
+        futures = [self.submit(row, predict_fn) for row in np.asarray(X, dtype=np.float64)]
+        return np.array([future.result(timeout) for future in futures])
+
+    def _collect(self):
+        # 阻塞等到第一条请求，再在截止时间内尽量攒批；超时后把已排队的请求也一并带走
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            batch = [item for item in items if item is not None]
+            if batch:
+                self._process(batch)
+            if len(batch) < len(items):  # 收到 close() 放入的结束标记
+                return
+
+    def _process(self, batch):
+        # 按预测函数分组（通常只有一组；模型热切换前后的请求可能各自固定在不同模型上）
+        groups = {}
+        for vector, future, predict_fn in batch:
+            groups.setdefault(predict_fn, []).append((vector, future))
+        for predict_fn, items in groups.items():
+            futures = [future for _, future in items]
+            try:
+                scores = predict_fn(np.stack([vector for vector, _ in items]))
+            except Exception as e:  # 模型出错时让这一组的每个调用方都拿到异常，而不是一直等待
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, score in zip(futures, scores):
+                future.set_result(score)
+        self.requests += len(batch)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": self.requests / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+    def close(self):
+        """处理完已排队的请求后停止后台线程"""
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
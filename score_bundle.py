@@ -0,0 +1,145 @@
+# 成绩预测模型包：把森林节点数组、特征名、类别取值和内容哈希写进一个不压缩的文件，加载时直接内存映射
+#
+# 文件布局：
+#   MAGIC(8字节) | 头部长度(uint64) | 头部JSON（utf-8） | 按64字节对齐的各个数组
+# 多个Streamlit进程映射同一个文件时，操作系统只保留一份物理内存
+import hashlib
+import json
+import mmap
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from score_forest import FlatForest
+
+MAGIC = b"SCOREBDL"
+BUNDLE_FORMAT_VERSION = 1
+_ALIGN = 64
+
+ModelBundle = namedtuple(
+    "ModelBundle", ["model", "feature_names", "unique_values", "content_hash", "meta"]
+)
+
+
+class BundleError(ValueError):
+    """模型包格式不正确或内容校验失败"""
+
+
+def _align(n):
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _content_hash(meta, arrays):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps(meta, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    for name in sorted(arrays):
+        h.update(name.encode("utf-8"))
+        h.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return h.hexdigest()
+
+
+def save_bundle(path, forest, unique_values, extra_meta=None):
+    """写出模型包，返回内容哈希"""
+    arrays = {name: np.ascontiguousarray(arr) for name, arr in forest.arrays().items()}
+    meta = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "feature_names": list(forest.feature_names),
+        "unique_values": unique_values,
+        "depth": forest.depth,
+    }
+    if extra_meta:
+        meta.update(extra_meta)
+    content_hash = _content_hash(meta, arrays)
+
+    # 先确定头部长度再计算各数组偏移：头部里写的偏移是相对数据区起点的
+    layout = {}
+    offset = 0
+    for name, arr in arrays.items():
+        layout[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset = _align(offset + arr.nbytes)
+    header = dict(meta, content_hash=content_hash, arrays=layout)
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header_bytes)).tobytes())
+        f.write(header_bytes)
+        for name, arr in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(arr.tobytes())
+    # 原子替换，正在运行的进程仍持有旧文件的映射，不受影响
+    os.replace(tmp_path, path)
+    return content_hash
+
+
+def read_header(path):
+    """只读取头部（特征名、版本、哈希等），不映射数组"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise BundleError(f"{path} 不是成绩预测模型包")
+        header_len = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        header = json.loads(f.read(header_len).decode("utf-8"))
+    if header.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise BundleError(f"不支持的模型包版本：{header.get('format_version')}")
+    header["data_start"] = _align(len(MAGIC) + 8 + header_len)
+    return header
+
+
+def load_bundle(path, verify=False):
+    """内存映射加载模型包；verify=True 时重新计算内容哈希并与头部比对"""
+    header = read_header(path)
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        arrays[name] = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=header["data_start"] + spec["offset"]
+        ).reshape(spec["shape"])
+
+    meta = {key: header[key] for key in header if key not in ("content_hash", "arrays", "data_start")}
+    if verify and _content_hash(meta, arrays) != header["content_hash"]:
+        raise BundleError(f"{path} 内容哈希校验失败，文件可能已损坏")
+
+    model = FlatForest.from_arrays(arrays, header["depth"], header["feature_names"])
+    return ModelBundle(
+        model=model,
+        feature_names=header["feature_names"],
+        unique_values=header["unique_values"],
+        content_hash=header["content_hash"],
+        meta=meta,
+    )
+
+
+def load_model_artifacts(bundle_path, model_path, feature_names_path, unique_values_path):
+    """加载预测所需的模型（ModelBundle）：优先内存映射模型包，没有时兜底读取旧的 joblib + pickle 文件
+
+    Streamlit应用和独立推理服务共用这一加载逻辑，保证两边使用同一份模型。旧文件兜底时，
+    content_hash 为三个文件内容的哈希，同样可以作为模型版本号。
+    """
+    if os.path.exists(bundle_path):
+        return load_bundle(bundle_path)
+    # 旧部署：joblib模型 + 两个pickle配置文件，现场转换为扁平化森林（joblib/sklearn 仅此时导入）
+    import pickle
+    from joblib import load
+    h = hashlib.blake2b(digest_size=16)
+    for path in (model_path, feature_names_path, unique_values_path):
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    with open(feature_names_path, "rb") as f:
+        feature_names = pickle.load(f)
+    with open(unique_values_path, "rb") as f:
+        unique_values = pickle.load(f)
+    return ModelBundle(
+        model=FlatForest.from_sklearn(load(model_path), feature_names),
+        feature_names=feature_names,
+        unique_values=unique_values,
+        content_hash=h.hexdigest(),
+        meta={"source": model_path},
+    )
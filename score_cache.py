@@ -0,0 +1,58 @@
+# 预测结果的LRU缓存：以编码后的特征向量为键，进程内所有会话共享，重复输入不再调用模型
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """有界LRU缓存，线程安全（Streamlit的每个会话运行在各自的线程里）"""
+
+    def __init__(self, predict_fn, maxsize=4096):
+        self.predict_fn = predict_fn
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # clear() 时加一；未命中的计算跨过一次 clear()（如模型热切换）时，结果不再写入缓存
+        self._generation = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def predict(self, vector, version=None, predict_fn=None):
+        """返回单个特征向量的预测结果；向量应已按滑块步长取整（见 encode_single）
+
+        version 为模型版本，是缓存键的一部分：固定在不同模型上的调用方不会拿到对方模型的结果。
+        predict_fn 为本次未命中时使用的预测函数（应与 version 对应），默认为构造时给出的函数。
+        """
+        key = (version, np.asarray(vector, dtype=np.float64).tobytes())
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            generation = self._generation
+
+        # 模型推理放在锁外，避免一个会话的预测阻塞其他会话的缓存命中；
+        # predict_fn 每行输出一个数时缓存float，输出多个数（如预测值+区间）时缓存tuple
+        predict_fn = predict_fn or self.predict_fn
+        output = np.asarray(predict_fn(np.asarray(vector, dtype=np.float64).reshape(1, -1))[0])
+        result = float(output) if output.ndim == 0 else tuple(output.tolist())
+        with self._lock:
+            if generation == self._generation:
+                self._data[key] = result
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
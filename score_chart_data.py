@@ -0,0 +1,50 @@
+# 图表数据精简层：在服务端用NumPy把逐个学生的明细压缩为直方图分箱、分位数摘要和降采样序列，
+# 浏览器只接收固定大小的聚合结果，传输量和渲染耗时与数据规模无关
+import numpy as np
+import pandas as pd
+
+DEFAULT_QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+
+def _finite(values):
+    values = np.asarray(values, dtype=np.float64).ravel()
+    return values[np.isfinite(values)]
+
+
+def histogram_bins(values, nbins=15, value_range=None):
+    """等宽分箱计数，返回每箱一行的DataFrame：下限、上限、中点、人数"""
+    counts, edges = np.histogram(_finite(values), bins=nbins, range=value_range)
+    return pd.DataFrame({
+        "下限": edges[:-1],
+        "上限": edges[1:],
+        "中点": (edges[:-1] + edges[1:]) / 2,
+        "人数": counts,
+    })
+
+
+def quantile_summary(values, quantiles=DEFAULT_QUANTILES):
+    """分位数摘要（Series，索引为分位点）；没有有效数据时全部为NaN"""
+    values = _finite(values)
+    if len(values) == 0:
+        return pd.Series(np.nan, index=list(quantiles), name="分位数")
+    return pd.Series(np.quantile(values, quantiles), index=list(quantiles), name="分位数")
+
+
+def downsample_series(x, y, max_points=2000):
+    """按顺序把序列分成 max_points/2 个桶，每桶保留最小值和最大值两个点（保留峰谷形状）
+
+    x 需已按绘图顺序排列；点数不超过 max_points 时原样返回。
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= max_points:
+        return x, y
+    buckets = max(max_points // 2, 1)
+    width = -(-n // buckets)
+    # 末尾用最后一个值补齐成 (buckets, width) 的矩阵，一次性求每桶的最小/最大位置
+    padded = np.concatenate([y, np.full(buckets * width - n, y[-1])]).reshape(buckets, width)
+    offsets = np.arange(buckets) * width
+    keep = np.concatenate([offsets + padded.argmin(axis=1), offsets + padded.argmax(axis=1)])
+    keep = np.unique(np.minimum(keep, n - 1))
+    return x[keep], y[keep]
@@ -0,0 +1,115 @@
+# 专业数据分析用的聚合立方体：一次扫描得到每个（专业, 性别）组合下各数值列的计数、求和与平方和；
+# 以及按组合排序的行号索引，下钻到某个专业/组合时只取一段切片，不再整表扫描
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+CUBE_KEYS = ["专业", "性别"]
+CUBE_STATS = ["count", "sum", "sumsq"]
+
+# positions：按组号稳定排序后的行位置；offsets[g]:offsets[g+1] 为组 g 在 positions 中的区间
+GroupIndex = namedtuple("GroupIndex", ["keys", "levels", "positions", "offsets"])
+
+
+def _group_codes(df, keys):
+    # 把多列分类编码合成一个组号（按keys顺序，前面的键变化最慢）；含缺失值的行无效
+    codes = []
+    levels = []
+    for key in keys:
+        cat = df[key].astype("category").cat
+        codes.append(cat.codes.to_numpy())
+        levels.append(cat.categories)
+    sizes = [len(level) for level in levels]
+    group_id = np.ravel_multi_index(codes, sizes) if len(df) else np.zeros(0, dtype=np.intp)
+    valid_rows = np.all(np.stack(codes) >= 0, axis=0) if len(df) else np.zeros(0, dtype=bool)
+    return levels, group_id, valid_rows, int(np.prod(sizes))
+
+
+def build_major_cube(df, keys=CUBE_KEYS):
+    """按keys组合分组，对全部浮点数值列（学号等整数编号不参与）一次性累加 count / sum / sumsq
+
+    返回的DataFrame以 (专业, 性别) 为行索引，列为 (数值列, 统计量) 两级索引，
+    另有一列 ("人数", "count") 记录组内行数。只保留实际出现的组合。
+    """
+    # 直接用bincount按组号累加，不经过groupby排序
+    levels, group_id, valid_rows, n_groups = _group_codes(df, keys)
+    data = {("人数", "count"): np.bincount(group_id[valid_rows], minlength=n_groups)}
+    for col in df.select_dtypes(include="floating").columns:
+        values = df[col].to_numpy(dtype=np.float64)
+        mask = valid_rows & ~np.isnan(values)
+        ids = group_id[mask]
+        values = values[mask]
+        data[(col, "count")] = np.bincount(ids, minlength=n_groups)
+        data[(col, "sum")] = np.bincount(ids, weights=values, minlength=n_groups)
+        data[(col, "sumsq")] = np.bincount(ids, weights=values * values, minlength=n_groups)
+
+    index = pd.MultiIndex.from_product(levels, names=keys)
+    cube = pd.DataFrame(data, index=index)
+    cube.columns = pd.MultiIndex.from_tuples(cube.columns)
+    return cube[cube[("人数", "count")] > 0]
+
+
+def build_group_index(df, keys=CUBE_KEYS):
+    """按组合排序的行号索引：一次稳定排序，之后任一组合（或前缀键，如只按专业）都是连续区间"""
+    levels, group_id, valid_rows, n_groups = _group_codes(df, keys)
+    rows = np.flatnonzero(valid_rows)
+    ids = group_id[rows]
+    positions = rows[np.argsort(ids, kind="stable")]
+    offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ids, minlength=n_groups), out=offsets[1:])
+    return GroupIndex(list(keys), levels, positions, offsets)
+
+
+def group_rows(index, selection):
+    """返回 selection（{键: 取值}，未给出或为None的键表示不限）对应的行位置
+
+    只固定前缀键（如只选专业）时结果是 positions 的一段视图；取值不存在时返回空数组。
+    """
+    code_choices = []
+    for key, level in zip(index.keys, index.levels):
+        value = selection.get(key)
+        if value is None:
+            code_choices.append(np.arange(len(level)))
+        elif value in level:
+            code_choices.append([level.get_loc(value)])
+        else:
+            return index.positions[:0]
+    sizes = [len(level) for level in index.levels]
+    groups = np.ravel_multi_index(np.meshgrid(*code_choices, indexing="ij"), sizes).ravel()
+    starts, ends = index.offsets[groups], index.offsets[groups + 1]
+    if np.all(starts[1:] == ends[:-1]):
+        return index.positions[starts[0]:ends[-1]]
+    return np.concatenate([index.positions[a:b] for a, b in zip(starts, ends)])
+
+
+def _rollup(cube, by):
+    # 把立方体上卷到 by 指定的维度（如只按专业），各统计量可直接相加
+    if isinstance(by, str):
+        by = [by]
+    return cube.groupby(level=by, observed=True, sort=False).sum()
+
+
+def cube_counts(cube, by="专业"):
+    """各组人数（Series）"""
+    return _rollup(cube, by)[("人数", "count")].rename("人数")
+
+
+def cube_mean(cube, columns, by="专业"):
+    """由 sum / count 得到各组均值，返回以 by 为索引的DataFrame"""
+    rolled = _rollup(cube, by)
+    return pd.DataFrame({
+        col: rolled[(col, "sum")] / rolled[(col, "count")] for col in columns
+    })
+
+
+def cube_std(cube, columns, by="专业"):
+    """由 sumsq / sum / count 得到各组样本标准差"""
+    rolled = _rollup(cube, by)
+    result = {}
+    for col in columns:
+        n = rolled[(col, "count")]
+        mean = rolled[(col, "sum")] / n
+        var = (rolled[(col, "sumsq")] - n * mean * mean) / (n - 1)
+        result[col] = np.sqrt(var.clip(lower=0))
+    return pd.DataFrame(result)
@@ -0,0 +1,240 @@
+# 学生成绩数据访问层：CSV首次加载时校验并规整为紧凑类型的Arrow文件，之后所有加载都直接内存映射
+# （多进程部署时由 score_launcher.py 预先生成，各工作进程只读映射同一个文件）
+import codecs
+import hashlib
+import json
+import logging
+import os
+import re
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as pa_ipc
+
+logger = logging.getLogger(__name__)
+
+# 缓存目录（与CSV同级），存放转换后的Arrow文件和版本索引
+CACHE_DIR = ".score_cache"
+# 缓存文件格式版本：规整规则变化时递增，旧格式的缓存文件会被重新转换
+CACHE_FORMAT = 2
+
+# CSV解析时的列类型：学号先按字符串读入（由规整阶段决定最终类型），性别/专业存为字典编码
+COLUMN_TYPES = {
+    "学号": pa.string(),
+    "性别": pa.dictionary(pa.int32(), pa.string()),
+    "专业": pa.dictionary(pa.int32(), pa.string()),
+}
+
+ID_COLUMN = "学号"
+CATEGORY_COLUMNS = ["性别", "专业"]
+# 数值列及其合法取值范围（闭区间）；超出范围或无法解析为数字的单元格记为缺失
+VALUE_RANGES = {
+    "每周学习时长（小时）": (0.0, 168.0),
+    "上课出勤率": (0.0, 1.0),
+    "期中考试分数": (0.0, 100.0),
+    "作业完成率": (0.0, 1.0),
+    "期末考试分数": (0.0, 100.0),
+}
+
+_HASH_BLOCK = 1 << 20
+
+
+# -------------------------- 版本识别（mtime + 内容哈希） --------------------------
+def _file_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _index_path(csv_path):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR, f"{stem}.json")
+
+
+def _cache_path(csv_path, version):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR,
+                        f"{stem}-{version}.f{CACHE_FORMAT}.arrow")
+
+
+def _version_caches(csv_path):
+    # 该CSV各版本的Arrow缓存：只匹配 “文件名-32位哈希[.f格式号].arrow”，
+    # 不会误匹配同目录下名字以本文件名开头的其他CSV（如 data.csv 与 data-2024.csv）的缓存
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR)
+    if not os.path.isdir(cache_dir):
+        return []
+    pattern = re.compile(rf"{re.escape(stem)}-[0-9a-f]{{32}}(\.f\d+)?\.arrow")
+    return [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if pattern.fullmatch(name)]
+
+
+def _write_json_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def dataset_version(csv_path):
+    """返回CSV当前内容的版本号；mtime和大小未变时直接复用索引中的哈希，不重新读文件"""
+    stat = os.stat(csv_path)
+    index_path = _index_path(csv_path)
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        if index["mtime_ns"] == stat.st_mtime_ns and index["size"] == stat.st_size:
+            return index["version"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    version = _file_hash(csv_path)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    _write_json_atomic(index_path, {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "version": version,
+    })
+    return version
+
+
+# -------------------------- CSV → Arrow 转换 --------------------------
+def sniff_encoding(sample):
+    """根据文件开头的字节判断编码，兼容原有的 utf-8 / gbk 两种编码"""
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "gbk"
+
+
+def _detect_encoding(csv_path, sample_size=1 << 16):
+    # 只嗅探文件开头，避免整文件解析两遍
+    with open(csv_path, "rb") as f:
+        return sniff_encoding(f.read(sample_size))
+
+
+# -------------------------- 类型规整与校验 --------------------------
+class StudentDataError(ValueError):
+    """CSV无法解析（如格式损坏、编码无法识别），整张表不可用"""
+
+_NUMBER_PATTERN = r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$"
+
+
+def _compact_dictionary(column):
+    # 字典编码的索引用能容纳全部类别的最小整数类型（pandas category 的编码同样按类别数取最小类型）
+    column = column.unify_dictionaries() if column.num_chunks > 1 else column
+    n_categories = max((len(chunk.dictionary) for chunk in column.chunks), default=0)
+    index_type = pa.int8() if n_categories <= 127 else pa.int16() if n_categories <= 32767 else pa.int32()
+    return column.cast(pa.dictionary(index_type, pa.string()))
+
+
+def _compact_ids(column):
+    # 全部为不以0开头的数字串时存为int64（8字节/行），否则保留字符串，避免丢失前导零
+    # 超过18位可能溢出int64，同样保留字符串
+    lengths = pc.utf8_length(column)
+    integral = pc.and_(
+        pc.and_(pc.utf8_is_digit(column), pc.less_equal(lengths, 18)),
+        pc.or_(pc.not_equal(pc.utf8_slice_codeunits(column, 0, 1), "0"), pc.equal(lengths, 1)),
+    )
+    if pc.all(integral).as_py():
+        return column.cast(pa.int64())
+    return column
+
+
+def _valid_values(name, column):
+    # 数值列：无法解析为数字或超出合法范围的单元格记为缺失并告警，一行坏数据不影响整张表
+    present = len(column) - column.null_count
+    if not (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)):
+        # 列中混有非数字内容时CSV解析为字符串，只转换形如数字的单元格
+        text = pc.utf8_trim_whitespace(column.cast(pa.string()))
+        column = pc.if_else(pc.match_substring_regex(text, _NUMBER_PATTERN), text, None).cast(pa.float64())
+    low, high = VALUE_RANGES[name]
+    in_range = pc.and_(pc.greater_equal(column, low), pc.less_equal(column, high))
+    n_invalid = present - (pc.sum(in_range.cast(pa.int64())).as_py() or 0)
+    if n_invalid:
+        logger.warning("“%s”列有 %d 个值无法解析或超出合法范围 [%s, %s]，已记为缺失", name, n_invalid, low, high)
+        column = pc.if_else(in_range, column, None)
+    return column.cast(pa.float32())
+
+
+def normalize_student_table(table):
+    """把各列规整为紧凑类型（整列向量化处理，不逐行检查）
+
+    - 学号：纯数字时为 int64，否则保持字符串
+    - 性别、专业：字典编码，索引为 int8（类别较多时自动放宽）
+    - 数值列：float32；无法解析或超出合法范围的值记为缺失并告警，缺失值由调用方决定是否丢弃
+    - 缺少的列跳过并告警，由使用方只读取存在的列
+    """
+    missing = [col for col in [ID_COLUMN, *CATEGORY_COLUMNS, *VALUE_RANGES] if col not in table.column_names]
+    if missing:
+        logger.warning("学生数据缺少列：%s", "、".join(missing))
+
+    columns = {}
+    for name in table.column_names:
+        column = table[name]
+        if name == ID_COLUMN:
+            column = _compact_ids(column)
+        elif name in CATEGORY_COLUMNS:
+            column = _compact_dictionary(column)
+        elif name in VALUE_RANGES:
+            column = _valid_values(name, column)
+        columns[name] = column
+    return pa.table(columns)
+
+
+def _convert_csv(csv_path, cache_path):
+    encoding = _detect_encoding(csv_path)
+    try:
+        table = pa_csv.read_csv(
+            csv_path,
+            read_options=pa_csv.ReadOptions(encoding=encoding),
+            convert_options=pa_csv.ConvertOptions(column_types=COLUMN_TYPES),
+        )
+    except (pa.ArrowInvalid, UnicodeDecodeError) as e:
+        raise StudentDataError(f"{os.path.basename(csv_path)} 无法解析：{e}") from e
+    # 多线程解析会产生多个分块字典，统一后才能写入单文件IPC格式
+    table = normalize_student_table(table.unify_dictionaries().combine_chunks())
+    # 先写临时文件再原子替换，多个进程同时转换也不会读到半成品
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa_ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, cache_path)
+
+    # 清理同一CSV的旧版本缓存
+    for path in _version_caches(csv_path):
+        if path != cache_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# -------------------------- 对外接口 --------------------------
+def load_student_table(csv_path):
+    """返回内存映射的Arrow表；缓存不存在或CSV已变化时先完成一次转换"""
+    version = dataset_version(csv_path)
+    cache_path = _cache_path(csv_path, version)
+    if not os.path.exists(cache_path):
+        _convert_csv(csv_path, cache_path)
+    source = pa.memory_map(cache_path, "r")
+    return pa_ipc.open_file(source).read_all()
+
+
+def load_student_frame(csv_path, columns=None, dropna=False):
+    """返回DataFrame；columns为None时读取全部列，否则只转换存在的指定列
+
+    数值列和学号逐列转换（split_blocks），不合并成二维块，直接引用内存映射的Arrow缓冲区（只读）：
+    同一台机器上的多个Streamlit进程共享操作系统页缓存中的同一份数据，每个进程只额外持有分类编码。
+    dropna=True 时在Arrow表上丢弃含缺失值的行，只有确实存在缺失值时才复制。不要在返回的DataFrame上
+    再调用 dropna()：pandas 2.x 在没有缺失值时也会深拷贝，每个进程又各持一份私有数据。
+    """
+    table = load_student_table(csv_path)
+    if columns is not None:
+        table = table.select([col for col in columns if col in table.column_names])
+    if dropna and any(column.null_count for column in table.columns):
+        table = table.drop_null()
+    return table.to_pandas(split_blocks=True)
@@ -0,0 +1,65 @@
+# 成绩预测模型的特征编码：按训练时的 feature_names 顺序做独热编码（与 pd.get_dummies 结果一致）
+import numpy as np
+import pandas as pd
+
+NUMERIC_FEATURES = ["每周学习时长（小时）", "上课出勤率", "期中考试分数", "作业完成率"]
+CATEGORY_FEATURES = ["性别", "专业"]
+INPUT_COLUMNS = CATEGORY_FEATURES + NUMERIC_FEATURES
+
+# 预测页面滑块的步长（出勤率、作业完成率按百分比滑块换算为小数后的步长）
+SLIDER_STEPS = {
+    "每周学习时长（小时）": 0.01,
+    "上课出勤率": 0.01,
+    "期中考试分数": 0.01,
+    "作业完成率": 0.01,
+}
+
+# 预测页面滑块的取值范围（同样换算为模型输入的单位）
+SLIDER_RANGES = {
+    "每周学习时长（小时）": (0.0, 50.0),
+    "上课出勤率": (0.0, 1.0),
+    "期中考试分数": (0.0, 100.0),
+    "作业完成率": (0.0, 1.0),
+}
+
+
+def missing_columns(frame):
+    """返回预测所需但frame中缺少的列"""
+    return [col for col in INPUT_COLUMNS if col not in frame.columns]
+
+
+def encode_features(frame, feature_names):
+    """把含原始输入列的DataFrame向量化编码为模型输入（列顺序与feature_names一致）
+
+    训练时未出现过的类别取值全部编码为0，与单条预测的处理方式相同。
+    """
+    encoded = np.zeros((len(frame), len(feature_names)), dtype=np.float64)
+    for i, feat in enumerate(feature_names):
+        if feat in NUMERIC_FEATURES:
+            encoded[:, i] = frame[feat].to_numpy(dtype=np.float64)
+            continue
+        prefix, _, value = feat.partition("_")
+        if prefix in CATEGORY_FEATURES:
+            encoded[:, i] = (frame[prefix].astype(str) == value).to_numpy()
+    return pd.DataFrame(encoded, columns=feature_names, index=frame.index)
+
+
+def encode_single(inputs, feature_names, round_to_slider=True):
+    """单条输入（原始列名→取值的dict）编码为一维特征向量
+
+    round_to_slider=True 时数值特征按滑块步长取整（页面使用，便于缓存命中）；
+    False 时保留原值，与 encode_features 对同一行的编码完全相同（推理服务使用）。
+    """
+    vector = np.zeros(len(feature_names), dtype=np.float64)
+    for i, feat in enumerate(feature_names):
+        if feat in NUMERIC_FEATURES:
+            value = float(inputs[feat])
+            if round_to_slider:
+                step = SLIDER_STEPS[feat]
+                value = round(round(value / step) * step, 10)
+            vector[i] = value
+            continue
+        prefix, _, value = feat.partition("_")
+        if prefix in CATEGORY_FEATURES and str(inputs[prefix]) == value:
+            vector[i] = 1.0
+    return vector
@@ -0,0 +1,223 @@
+# 随机森林回归模型的扁平化推理引擎：把所有树的节点拼成连续数组，用NumPy对一批样本同时遍历全部树
+import numpy as np
+import pandas as pd
+
+# 批量样本数达到此值时按树遍历（见 FlatForest._tree_major_leaf_values），更少时所有树一起遍历
+TREE_MAJOR_MIN_ROWS = 1024
+TREE_MAJOR_CHUNK_ROWS = 65536
+
+
+def _float32_floor(threshold):
+    # 输入是float32，取不大于原阈值的最大float32，比较结果与float64阈值完全一致
+    thr32 = threshold.astype(np.float32)
+    too_big = thr32.astype(np.float64) > threshold
+    thr32[too_big] = np.nextafter(thr32[too_big], np.float32(-np.inf))
+    return thr32
+
+
+class FlatForest:
+    """RandomForestRegressor 的纯NumPy替身，predict 结果与 sklearn 一致
+
+    节点数组（所有树首尾相接）：
+    - feature / threshold：分裂特征与阈值；叶子节点的阈值为 +inf，保证一直“向左”
+    - children：形状 (n_nodes, 2)，[左子节点, 右子节点]；叶子节点两列都指向自己
+    - value：节点输出值（只在叶子节点上使用）
+    - roots：每棵树根节点在数组中的位置
+    """
+
+    def __init__(self, feature, threshold, children, value, roots, depth, feature_names):
+        # 保留传入数组的dtype：from_sklearn 生成 intp/float64（取数最快），
+        # 压缩后的森林使用窄类型（见 forest_compact.py），两者都可直接内存映射
+        self.feature = np.asarray(feature)
+        self.threshold = np.asarray(threshold)
+        self.children = np.asarray(children)
+        self.value = np.asarray(value)
+        self.roots = np.asarray(roots)
+        self.depth = int(depth)
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        # 遍历直接在原dtype的节点数组上取数（压缩森林的窄类型数组与内存映射共享，不在每个进程里拷贝一份）；
+        # 只有每层的节点下标临时数组用 intp 计算，窄类型在 node + node 中会溢出
+        self._children_flat = self.children.reshape(-1)
+        self._roots = self.roots.astype(np.intp)
+        self._threshold32 = None
+        self._quantile_plans = {}
+
+    # -------------------------- 构造与存取 --------------------------
+    @classmethod
+    def from_sklearn(cls, model, feature_names=None):
+        if feature_names is None:
+            feature_names = model.feature_names_in_
+        features, thresholds, children, values, roots = [], [], [], [], []
+        offset = 0
+        depth = 0
+        for est in model.estimators_:
+            tree = est.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left < 0
+            ids = np.arange(n, dtype=np.intp) + offset
+            left = np.where(is_leaf, ids, tree.children_left + offset)
+            right = np.where(is_leaf, ids, tree.children_right + offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            children.append(np.stack([left, right], axis=1))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            depth = max(depth, tree.max_depth)
+            offset += n
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children=np.concatenate(children).astype(np.intp),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            depth=depth,
+            feature_names=feature_names,
+        )
+
+    def arrays(self):
+        """全部节点数组（写入模型包时使用）"""
+        return {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "children": self.children,
+            "value": self.value,
+            "roots": self.roots,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, depth, feature_names):
+        # 数组可以是内存映射的只读视图，dtype一致时不会产生拷贝
+        return cls(depth=depth, feature_names=feature_names, **arrays)
+
+    # -------------------------- 推理 --------------------------
+    def _as_matrix(self, X):
+        if isinstance(X, pd.DataFrame):
+            # 列顺序已一致时跳过按列名重排（单条预测的主要开销）
+            if list(X.columns) != self.feature_names:
+                X = X[self.feature_names]
+            X = X.to_numpy()
+        # sklearn 的树在 float32 上比较阈值，这里先截断到float32以得到相同的分支，
+        # 再转换为阈值的dtype，避免遍历时每层都做类型提升
+        X = np.asarray(X, dtype=np.float32).astype(self.threshold.dtype, copy=False)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"特征数不匹配：期望{self.n_features}列，实际{X.shape[1]}列")
+        return X
+
+    def _single_leaf_values(self, x):
+        # 单样本快速路径：不需要行偏移，每层只做三次取数
+        node = self._roots
+        for _ in range(self.depth):
+            go_right = x[self.feature[node].astype(np.intp, copy=False)] > self.threshold[node]
+            node = self._children_flat[node + node + go_right].astype(np.intp, copy=False)
+        return self.value[node]
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def nbytes(self):
+        return sum(arr.nbytes for arr in self.arrays().values())
+
+    def tree_ranges(self):
+        """每棵树在节点数组中的 [起点, 终点)"""
+        ends = np.append(self.roots[1:], len(self.value))
+        return list(zip(self.roots.tolist(), ends.tolist()))
+
+    def _float32_threshold(self):
+        # 按树遍历时比较用的float32阈值（首次按树遍历时生成）；压缩森林的阈值已是float32下界，直接使用
+        if self._threshold32 is None:
+            if self.threshold.dtype == np.float32:
+                self._threshold32 = self.threshold
+            else:
+                self._threshold32 = _float32_floor(self.threshold)
+        return self._threshold32
+
+    def _tree_major_leaf_values(self, X, out, chunk_rows=TREE_MAJOR_CHUNK_ROWS):
+        # 按树遍历：样本按特征转置为连续的float32数组，每棵树单独对整块样本向下走，
+        # 取数都落在本树连续存放的节点和同一特征的连续内存上；比所有树一起遍历少了 (样本数×树数) 的索引矩阵
+        threshold = self._float32_threshold()
+        n_rows = X.shape[0]
+        for start in range(0, n_rows, chunk_rows):
+            block = np.ascontiguousarray(X[start:start + chunk_rows].T, dtype=np.float32)
+            rows = block.shape[1]
+            flat = block.reshape(-1)
+            row_ids = np.arange(rows, dtype=np.intp)
+            # 每个节点的分裂特征在本块中的起点：只在本次调用内存在的临时数组，不随森林常驻
+            offsets = self.feature.astype(np.intp, copy=False) * rows
+            for t, root in enumerate(self._roots):
+                node = np.full(rows, root, dtype=np.intp)
+                for _ in range(self.depth):
+                    go_right = flat[offsets[node] + row_ids] > threshold[node]
+                    node = self._children_flat[node + node + go_right].astype(np.intp, copy=False)
+                out[start:start + rows, t] = self.value[node]
+        return out
+
+    def leaf_values(self, X, chunk_rows=4096):
+        """返回每个样本在每棵树上的叶子输出，形状 (n_samples, n_trees)"""
+        X = self._as_matrix(X)
+        n_rows = X.shape[0]
+        if n_rows == 1:
+            return self._single_leaf_values(X[0])[None, :]
+        out = np.empty((n_rows, len(self.roots)), dtype=self.value.dtype)
+        if n_rows >= TREE_MAJOR_MIN_ROWS:
+            return self._tree_major_leaf_values(X, out)
+        for start in range(0, n_rows, chunk_rows):
+            block = X[start:start + chunk_rows].reshape(-1)
+            rows = block.size // self.n_features
+            row_offset = (np.arange(rows, dtype=np.intp) * self.n_features)[:, None]
+            node = np.broadcast_to(self._roots, (rows, len(self.roots))).copy()
+            # 所有树、所有样本一起向下走一层；到达叶子后原地自环，走满最大深度即可
+            for _ in range(self.depth):
+                go_right = block[row_offset + self.feature[node]] > self.threshold[node]
+                node = self._children_flat[node + node + go_right].astype(np.intp, copy=False)
+            out[start:start + rows] = self.value[node]
+        return out
+
+    @staticmethod
+    def _mean(leaves):
+        # 与 ndarray.mean 的计算完全相同（求和后除以树数），少了其Python层的参数处理，单条预测时可见
+        return np.add.reduce(leaves, axis=1, dtype=np.float64) / leaves.shape[1]
+
+    def predict(self, X):
+        return self._mean(self.leaf_values(X))
+
+    def predict_interval(self, X, coverage=0.8):
+        """点预测与预测区间，一次遍历得到：返回形状 (n_samples, 3) 的 [预测值, 下限, 上限]
+
+        区间取各棵树输出的 (1-coverage)/2 与 (1+coverage)/2 分位数，反映树之间的分歧程度。
+        分位数按线性插值计算（与 np.quantile 默认方法一致）：只用 np.partition 找出插值用到的
+        几个顺序统计量，不对每行的全部树输出排序，也没有 np.quantile 的逐行开销。
+        """
+        positions, kth = self._quantile_plan(coverage)
+        leaves = self.leaf_values(X)
+        mean = self._mean(leaves)
+        # leaves 是本次遍历新建的数组，求完均值后原地分区，省去一次复制
+        leaves.partition(kth, axis=1)
+        if leaves.shape[0] == 1:
+            # 单条预测：只有一行时逐元素取数比整列运算的调用开销小；用NumPy标量计算，与下面的整列结果逐位一致
+            ranked = leaves[0]
+            return np.array([[mean[0]] + [ranked[lo] * w_lo + ranked[hi] * w_hi for lo, hi, w_lo, w_hi in positions]])
+        out = np.empty((leaves.shape[0], 3))
+        out[:, 0] = mean
+        for j, (lo, hi, w_lo, w_hi) in enumerate(positions, start=1):
+            out[:, j] = leaves[:, lo] * w_lo + leaves[:, hi] * w_hi
+        return out
+
+    def _quantile_plan(self, coverage):
+        # 每个 coverage 对应的插值位置 [(下位次, 上位次, 下权重, 上权重)] 和需要的顺序统计量，按树数计算一次后缓存
+        plan = self._quantile_plans.get(coverage)
+        if plan is None:
+            last = self.n_trees - 1
+            positions = []
+            for q in ((1 - coverage) / 2, (1 + coverage) / 2):
+                pos = q * last
+                lo = int(pos)
+                frac = pos - lo
+                positions.append((lo, min(lo + 1, last), 1 - frac, frac))
+            plan = positions, np.array(sorted({k for lo, hi, _, _ in positions for k in (lo, hi)}), dtype=np.intp)
+            self._quantile_plans[coverage] = plan
+        return plan
@@ -0,0 +1,85 @@
+# 学号前缀索引：把数据集中的学号去重排序为紧凑数组（整数学号为int64，其余为定宽UTF-8字节串），
+# 输入前缀后用二分查找定位匹配区间，只取前几个结果，耗时与学号总数基本无关（O(log n)）
+#
+# 整数学号按数值排序，同一前缀在每种位数下各对应一个连续区间（如前缀“2023”在10位学号中为
+# [2023000000, 2024000000)），按位数从短到长依次取；字符串学号按字节序排序，前缀对应一个区间。
+import numpy as np
+import pandas as pd
+
+# 整数学号最多18位，超过时按字符串处理（见 score_data._compact_ids）
+_MAX_DIGITS = 18
+
+
+def _sorted_unique(values):
+    # 排序后相邻去重（np.unique 在大数组上明显更慢）；学号通常已基本有序，排序很快
+    values = np.sort(values)
+    if len(values) > 1:
+        values = values[np.concatenate([[True], values[1:] != values[:-1]])]
+    return values
+
+
+class StudentIdIndex:
+    """已排序、去重的学号数组，支持前缀区间查询
+
+    - count(prefix)：匹配前缀的学号数
+    - search(prefix, limit)：按顺序返回前 limit 个匹配的学号（字符串）
+    """
+
+    def __init__(self, ids):
+        values = pd.Series(ids).dropna()
+        self.integer_ids = pd.api.types.is_integer_dtype(values.dtype)
+        if self.integer_ids:
+            self._ids = _sorted_unique(values.to_numpy(dtype=np.int64))
+            nonnegative = self._ids[self._ids >= 0]
+            self._digits = (
+                (len(str(nonnegative[0])), len(str(nonnegative[-1]))) if len(nonnegative) else (1, 0)
+            )
+        else:
+            # 多留一个字节，前缀 + b"\xff" 作为上界时不会被截断（UTF-8编码中不会出现0xff）
+            encoded = values.astype(str).str.encode("utf-8")
+            width = int(encoded.str.len().max()) + 1 if len(encoded) else 1
+            self._ids = _sorted_unique(encoded.to_numpy().astype(f"S{width}"))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _ranges(self, prefix):
+        # 返回匹配前缀的 [start, stop) 位置区间列表（按结果顺序）
+        prefix = prefix.strip()
+        if not self.integer_ids:
+            key = prefix.encode("utf-8")
+            if len(key) >= self._ids.dtype.itemsize:
+                return []
+            start = np.searchsorted(self._ids, key, side="left")
+            stop = np.searchsorted(self._ids, key + b"\xff", side="left")
+            return [(int(start), int(stop))]
+        if not prefix:
+            return [(0, len(self._ids))]
+        if not prefix.isdigit() or len(prefix) > _MAX_DIGITS or (prefix[0] == "0" and len(prefix) > 1):
+            return []
+        value, n_digits = int(prefix), len(prefix)
+        if value == 0:
+            return [tuple(int(i) for i in np.searchsorted(self._ids, [0, 1]))]
+        shortest, longest = self._digits
+        ranges = []
+        for digits in range(max(n_digits, shortest), longest + 1):
+            scale = 10 ** (digits - n_digits)
+            bounds = np.searchsorted(self._ids, [value * scale, (value + 1) * scale])
+            if bounds[1] > bounds[0]:
+                ranges.append((int(bounds[0]), int(bounds[1])))
+        return ranges
+
+    def count(self, prefix):
+        """匹配前缀的学号个数"""
+        return sum(stop - start for start, stop in self._ranges(prefix))
+
+    def search(self, prefix, limit=10):
+        """返回前 limit 个以 prefix 开头的学号（字符串，整数学号先按位数再按数值排序）"""
+        matches = []
+        for start, stop in self._ranges(prefix):
+            matches.extend(self._ids[start:min(stop, start + limit - len(matches))])
+            if len(matches) >= limit:
+                break
+        if self.integer_ids:
+            return [str(int(value)) for value in matches]
+        return [value.decode("utf-8") for value in matches]
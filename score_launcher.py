@@ -0,0 +1,87 @@
+# 多进程部署启动器：先生成各工作进程共享的只读数据，再启动多个 Streamlit 进程（由前端负载均衡分发）
+#
+# 共享方式：数据集规整为 .score_cache 下的Arrow文件，模型为 score_model.bundle（扁平数组），
+# 两者都是不压缩的定长布局，工作进程通过 load_resources() 只读内存映射，
+# 同一台机器上的物理内存只有一份（操作系统页缓存），增加一个工作进程只增加它自己的私有内存。
+# 启动器在启动工作进程之前完成转换，避免多个进程同时转换同一份CSV。
+#
+# 用法：python score_launcher.py --workers 4 --base-port 8501
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from score_bundle import load_model_artifacts, save_bundle
+from score_data import load_student_table
+from score_paths import DEFAULT_PATHS, model_paths
+
+
+def prepare_shared_store(config=DEFAULT_PATHS):
+    """生成工作进程共享的数据集缓存和模型包，返回 {名称: (路径, 字节数)}"""
+    # 数据集：CSV未变化时直接复用已有缓存
+    table = load_student_table(config["csv_path"])
+    store = {"数据集": (config["csv_path"], table.nbytes)}
+
+    # 模型：只有旧的 joblib + pickle 文件时转换为模型包；之后工作进程都映射同一个文件
+    bundle_path = config["bundle_path"]
+    if not os.path.exists(bundle_path):
+        bundle = load_model_artifacts(*model_paths(config))
+        save_bundle(bundle_path, bundle.model, bundle.unique_values, extra_meta=bundle.meta)
+    store["模型包"] = (bundle_path, os.path.getsize(bundle_path))
+    return store
+
+
+def start_workers(n_workers, base_port, address, script="streamlit_score_predict.py"):
+    """启动 n_workers 个 Streamlit 进程，端口依次为 base_port, base_port+1, ..."""
+    workers = []
+    for i in range(n_workers):
+        port = base_port + i
+        workers.append(subprocess.Popen([
+            sys.executable, "-m", "streamlit", "run", script,
+            "--server.port", str(port), "--server.address", address, "--server.headless", "true",
+        ]))
+    return workers
+
+
+def stop_workers(workers, timeout=10.0):
+    for proc in workers:
+        if proc.poll() is None:
+            proc.terminate()
+    deadline = time.monotonic() + timeout
+    for proc in workers:
+        try:
+            proc.wait(max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# -------------------------- 命令行入口 --------------------------
+def main():
+    parser = argparse.ArgumentParser(description="多进程启动成绩分析与预测应用（共享只读数据与模型）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="工作进程数")
+    parser.add_argument("--base-port", type=int, default=8501, help="第一个工作进程的端口")
+    parser.add_argument("--address", default="127.0.0.1", help="监听地址")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for name, (path, nbytes) in prepare_shared_store().items():
+        print(f"{name}：{path}（{nbytes / 1024 / 1024:.1f} MB，只读共享）")
+    print(f"共享数据准备完成（耗时{time.perf_counter() - start:.2f}秒）")
+
+    workers = start_workers(args.workers, args.base_port, args.address)
+    print(f"已启动{len(workers)}个工作进程：端口 {args.base_port}~{args.base_port + len(workers) - 1}", flush=True)
+    # 收到终止信号时一并关闭工作进程；任一工作进程退出也全部关闭，交由外部进程管理器重启
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while all(proc.poll() is None for proc in workers):
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_workers(workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# 成绩分析与预测应用：项目介绍页面（仅依赖streamlit，由 streamlit_score_predict.py 在首次进入该页面时导入）
+import streamlit as st
+
+
+# -------------------------- 3. 界面1：项目介绍页面（完全保留原功能+右侧上下张图片切换展示） --------------------------
+def page1_project_intro():
+    st.title("学生成绩分析与预测系统")
+    
+    # 整体布局：左侧文字介绍，右侧图片切换展示
+    left_col, right_col = st.columns([2, 1])  # 左侧占比2，右侧占比1，可根据需求调整比例
+
+    # 左侧：原有所有文字介绍功能（完全保留不变）
+    with left_col:
+        # 项目概述
+        with st.container():
+            st.subheader("📋 项目概述")
+            st.write("""
+            本项目是一个基于Streamlit的学生成绩分析平台，通过该平台可可视化同学学习状态，帮助教育工作者和学生深入了解学习表现，并预测期末考试成绩。
+            """)
+            
+            # 主要特点
+            st.subheader("✨ 主要特点")
+            st.markdown("""
+            - **数据可视化**：多维度展示学生学业数据
+            - **专业分析**：多维度的专业统计分析
+            - **智能预测**：基于学习维度建模的成绩预测
+            - **学习建议**：根据预测结果提供个性化反馈
+            """)
+        
+        # 项目目标
+        with st.container():
+            st.subheader("🎯 项目目标")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.markdown("#### 目标一：分析维度覆盖")
+                st.write("- 识别关键学习指标\n- 探索维度相关性\n- 维度密度及分布")
+            with col2:
+                st.markdown("#### 目标二：可视化展示")
+                st.write("- 专业对比分析\n- 性别差异分析\n- 学习习惯识别")
+            with col3:
+                st.markdown("#### 目标三：成绩预测")
+                st.write("- 机器学习模型\n- 个性化反馈\n- 及时干预预警")
+        
+        # 技术架构
+        with st.container():
+            st.subheader("🔧 技术架构")
+            arch_cols = st.columns(4)
+            with arch_cols[0]:
+                st.markdown("#### 前端框架\nStreamlit")
+            with arch_cols[1]:
+                st.markdown("#### 数据处理\nPandas\nNumPy")
+            with arch_cols[2]:
+                st.markdown("#### 可视化\nPlotly\nMatplotlib")
+            with arch_cols[3]:
+                st.markdown("#### 机器学习\nScikit-Learn")
+
+    # 右侧：图片切换展示（先显示图片，再显示切换按钮：上一张/下一张按钮切换+三张图片）
+    with right_col:
+        st.subheader("🖼️ 系统界面预览")
+        
+        # 定义三张图片的信息（图片路径可根据你的实际文件修改）
+        image_configs = {
+            1: {"path": "项目介绍.png", "caption": "项目介绍界面"},
+            2: {"path": "专业数据分析.png", "caption": "专业数据分析界面"},
+            3: {"path": "期末成绩预测.png", "caption": "期末成绩预测界面"}
+        }
+        total_images = len(image_configs)  # 获取图片总数（自动适配，后续可增减图片）
+        
+        # 初始化会话状态，用于保存当前显示的图片索引
+        if "current_image_idx" not in st.session_state:
+            st.session_state.current_image_idx = 1
+        
+        # 第一步：先显示当前图片及索引提示（提升用户体验）
+        current_img = image_configs[st.session_state.current_image_idx]
+        st.caption(f"当前：第{st.session_state.current_image_idx}/{total_images}张")
+        
+        try:
+            st.image(
+                current_img["path"],
+                caption=current_img["caption"],
+                use_container_width=True  # 自适应右侧列宽度
+            )
+        except FileNotFoundError:
+            st.warning(f"图片 {current_img['path']} 未找到，请检查文件路径")
+        except Exception as e:
+            st.warning(f"图片加载失败：{str(e)}")
+        
+        # 第二步：调整按钮布局，让“下一张”与图片右对齐
+        # 用3列布局：第1列放“上一张”，第2列占位，第3列放“下一张”
+        btn_col1, _, btn_col2 = st.columns([1, 2, 1])  # 中间列占位，实现按钮左右分布
+        with btn_col1:
+            # 上一张按钮
+            if st.button("⬅️ 上一张", key="prev_btn"):
+                if st.session_state.current_image_idx > 1:
+                    st.session_state.current_image_idx -= 1
+                else:
+                    st.session_state.current_image_idx = total_images
+        with btn_col2:
+            # 下一张按钮（与图片右对齐）
+            if st.button("下一张 ➡️", key="next_btn"):
+                if st.session_state.current_image_idx < total_images:
+                    st.session_state.current_image_idx += 1
+                else:
+                    st.session_state.current_image_idx = 1
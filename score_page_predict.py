@@ -0,0 +1,257 @@
+# 成绩分析与预测应用：成绩预测页面（单条预测 + 批量预测），由 streamlit_score_predict.py 在首次进入该页面时导入
+import io
+
+import streamlit as st
+
+from score_batch import LOWER_COLUMN, RESULT_COLUMN, UPPER_COLUMN, count_rows, predict_csv_in_chunks, write_result_chunk
+from score_features import INPUT_COLUMNS, SLIDER_RANGES, encode_single
+from score_whatif import sensitivity_curve, sensitivity_surface
+
+# 假设分析扫描的特征；出勤率、作业完成率以百分比显示，与滑块一致
+WHATIF_FEATURES = ["每周学习时长（小时）", "作业完成率"]
+PERCENT_FEATURES = {"上课出勤率", "作业完成率"}
+# 学号自动补全最多列出的匹配数
+AUTOCOMPLETE_LIMIT = 10
+
+
+def _display(feature, values):
+    return values * 100 if feature in PERCENT_FEATURES else values
+
+
+def _axis_title(feature):
+    return f"{feature}（%）" if feature in PERCENT_FEATURES else feature
+
+
+# 滑块默认值（百分比特征为整数百分数，与滑块一致）
+SLIDER_DEFAULTS = {"每周学习时长（小时）": 15.0, "上课出勤率": 90, "期中考试分数": 60.0, "作业完成率": 80}
+
+
+def _prefill(record, unique_values):
+    """输入控件的默认值：找到学号时用该学生的真实数据（限制在滑块范围内），否则用原有默认值"""
+    defaults = dict(SLIDER_DEFAULTS, 性别=0, 专业=0)
+    if record is None:
+        return defaults
+    for feature in SLIDER_DEFAULTS:
+        if record[feature] is None:
+            continue
+        low, high = SLIDER_RANGES[feature]
+        value = min(max(record[feature], low), high)
+        defaults[feature] = int(round(value * 100)) if feature in PERCENT_FEATURES else round(value, 2)
+    for feature in ("性别", "专业"):
+        if record[feature] in unique_values[feature]:
+            defaults[feature] = list(unique_values[feature]).index(record[feature])
+    return defaults
+
+
+def _prescore_caption(prescore_index, student_id, record):
+    if prescore_index is None:
+        st.caption("尚未生成离线预评分结果（python score_prescore.py），学号仅记录在审计日志中")
+    elif record is None:
+        st.caption(f"未找到学号 {student_id}，请手动填写学习数据")
+    else:
+        parts = [f"已载入学号 {student_id} 的真实数据"]
+        if record[RESULT_COLUMN] is not None:
+            parts.append(f"离线预测 {record[RESULT_COLUMN]:.1f} 分"
+                         f"（80% 区间 {record[LOWER_COLUMN]:.1f} ~ {record[UPPER_COLUMN]:.1f}）")
+        if record.get("期末考试分数") is not None:
+            parts.append(f"实际期末成绩 {record['期末考试分数']:.1f} 分")
+        st.info("，".join(parts) + f"。评分于 {prescore_index.scored_at}（模型版本 {prescore_index.model_version[:8]}）")
+
+
+# -------------------------- 5. 界面3：成绩预测页面（图片调大+居中显示） --------------------------
+def _pick_student_id(typed, id_index):
+    """学号自动补全：输入的是完整学号时直接使用；是前缀时列出前几个匹配供选择
+
+    返回 (学号, 是否还在等待选择)。
+    """
+    if not typed or id_index is None:
+        return typed, False
+    matches = id_index.search(typed, limit=AUTOCOMPLETE_LIMIT)
+    if not matches or matches[0] == typed:
+        return typed, False
+    total = id_index.count(typed)
+    picked = st.selectbox(
+        f"匹配的学号（共 {total} 个" + (f"，显示前 {len(matches)} 个）" if total > len(matches) else "）"),
+        options=matches, index=None, placeholder="选择学号，或继续输入以缩小范围"
+    )
+    return (picked, False) if picked else (typed, True)
+
+
+def page3_score_prediction(model, unique_values, feature_names, prediction_cache, audit_log, model_version,
+                           prescore_index=None, id_index=None, predict_rows=None):
+    st.title("期末成绩预测")
+    st.write("请输入学生的学习信息，系统将基于机器学习模型预测期末成绩并提供学习建议")
+    st.divider()
+
+    # 输入区域
+    with st.container():
+        st.subheader("📋 学生信息输入")
+        st.markdown("---")
+        col_left, col_right = st.columns([1, 1.5])  # 左窄右宽比例
+
+        # 左侧：文本输入+下拉框（完全保留原有逻辑）
+        with col_left:
+            typed = st.text_input("学号", placeholder="请输入学号或前缀（如2023001）").strip()
+            # 输入前缀时在排序的学号索引上二分查找，列出匹配项供选择
+            student_id, picking = _pick_student_id(typed, id_index)
+            # 在离线预评分结果表上按学号二分查找，找到时用该学生的真实数据预填下方输入（不读CSV、不调用模型）
+            record = prescore_index.lookup(student_id) if prescore_index is not None and student_id else None
+            defaults = _prefill(record, unique_values)
+            gender = st.selectbox("性别", options=unique_values['性别'], index=defaults['性别'])
+            major = st.selectbox("专业", options=unique_values['专业'], index=defaults['专业'])
+            # 预测按钮（左侧底部，宽按钮样式）
+            predict_btn = st.button("预测期末成绩", type="primary", use_container_width=True)
+
+        # 右侧：滑块组（完全保留原有逻辑）
+        with col_right:
+            study_hour = st.slider(
+                "每周学习时长（小时）", 
+                min_value=0.0, max_value=50.0, value=defaults['每周学习时长（小时）'], step=0.01
+            )
+            attendance = st.slider(
+                "上课出勤率（%）", 
+                min_value=0, max_value=100, value=defaults['上课出勤率'], step=1
+            ) / 100  # 转换为小数（匹配模型训练格式）
+            mid_score = st.slider(
+                "期中考试分数", 
+                min_value=0.0, max_value=100.0, value=defaults['期中考试分数'], step=0.01
+            )
+            homework_rate = st.slider(
+                "作业完成率（%）", 
+                min_value=0, max_value=100, value=defaults['作业完成率'], step=1
+            ) / 100  # 转换为小数（匹配模型训练格式）
+
+        if student_id and not picking:
+            _prescore_caption(prescore_index, student_id, record)
+
+    # 预测结果展示
+    if predict_btn:
+        # 验证必填项（学号可选，核心特征必填）
+        if study_hour == 0 or attendance == 0 or mid_score == 0 or homework_rate == 0:
+            st.error("请完善学习数据输入（学习时长、出勤率、期中分数、作业完成率不能为空）")
+            return
+
+        st.divider()
+        st.subheader("📊 预测结果")
+        
+        # 构造模型输入向量（数值特征按滑块步长取整，独热编码分类特征）
+        inputs = {
+            '性别': gender,
+            '专业': major,
+            '每周学习时长（小时）': study_hour,
+            '上课出勤率': attendance,
+            '期中考试分数': mid_score,
+            '作业完成率': homework_rate
+        }
+        input_vector = encode_single(inputs, feature_names)
+        # 模型预测（经过共享缓存，重复输入不再调用模型）：同一次遍历得到预测值和各棵树给出的区间。
+        # 缓存按模型版本分开，未命中时用本次渲染固定的 model 预测（predict_rows 为经由合并器的同一个模型），
+        # 预测值、审计日志中的模型版本与下方的假设分析都来自同一个模型
+        estimate, lower, upper = prediction_cache.predict(
+            input_vector, version=model_version, predict_fn=predict_rows or model.predict_interval
+        )
+        final_score = round(estimate, 1)
+        # 写入审计日志（仅追加到内存缓冲，由后台线程批量落盘）
+        audit_log.record({**inputs, "学号": student_id or None, "模型版本": model_version, "预测期末成绩": final_score})
+
+        # 结果展示
+        st.metric("预测期末成绩", f"{final_score}分", delta=None)
+        st.caption(f"80% 预测区间：{lower:.1f} ~ {upper:.1f} 分（由随机森林各棵树预测的分布得到，区间越宽越不确定）")
+        cache_stats = prediction_cache.stats()
+        st.caption(f"预测缓存：命中 {cache_stats['hits']} 次，未命中 {cache_stats['misses']} 次")
+
+        # 结果提示+图片
+        if final_score >= 60:
+            st.success("🎉 恭喜！预测成绩及格啦！继续保持优秀表现~")
+            try:
+                empty_col1, img_col, empty_col2 = st.columns([1, 10, 1]) 
+                with img_col:
+                    st.image("xibao.jpg", caption="成绩优秀！", use_container_width=True)
+            except:
+                st.markdown("📌 建议：保持当前学习节奏，重点巩固薄弱知识点")
+        else:
+            st.warning("💪 没关系！预测成绩暂未及格，针对性提升后可显著进步")
+            try:
+                # 统一三列布局，保证两张图片居中效果一致
+                empty_col1, img_col, empty_col2 = st.columns([1, 10, 1])
+                with img_col:
+                    st.image("jiayou.jpg", caption="继续努力！",use_container_width=True)
+            except:
+                st.markdown("📌 建议：参考下方学习建议，重点优化薄弱环节")
+
+        whatif_panel(model, input_vector, feature_names, final_score)
+
+
+# -------------------------- 5.0 成绩预测页面：假设分析（每条曲线/曲面一次批量预测） --------------------------
+def whatif_panel(model, input_vector, feature_names, final_score):
+    # plotly 只在点击预测后用到，延迟导入，不拖慢预测页面首屏
+    import plotly.graph_objects as go
+
+    st.divider()
+    st.subheader("🔍 假设分析：如果投入更多会怎样？")
+    st.caption("固定其余输入，在滑块的完整范围内扫描所选因素，曲线上的红点为当前输入")
+    tabs = st.tabs([f"{feature}" for feature in WHATIF_FEATURES] + ["两个因素同时变化"])
+    for tab, feature in zip(tabs, WHATIF_FEATURES):
+        curve = sensitivity_curve(model, input_vector, feature_names, feature)
+        current = input_vector[feature_names.index(feature)]
+        fig = go.Figure(go.Scatter(
+            x=_display(feature, curve[feature]), y=curve["预测成绩"], mode="lines", name="预测成绩"
+        ))
+        fig.add_trace(go.Scatter(
+            x=[_display(feature, current)], y=[final_score], mode="markers",
+            marker=dict(color="red", size=10), name="当前输入"
+        ))
+        fig.update_layout(xaxis_title=_axis_title(feature), yaxis_title="预测期末成绩", showlegend=False)
+        with tab:
+            st.plotly_chart(fig, use_container_width=True)
+            gain = curve["预测成绩"].max() - final_score
+            st.caption(f"仅调整{_axis_title(feature)}，预测成绩最多还能提高 {max(gain, 0):.1f} 分")
+
+    feature_x, feature_y = WHATIF_FEATURES[:2]
+    grid_x, grid_y, scores = sensitivity_surface(model, input_vector, feature_names, feature_x, feature_y)
+    fig = go.Figure(go.Heatmap(
+        x=_display(feature_x, grid_x), y=_display(feature_y, grid_y), z=scores,
+        colorscale="Greens", colorbar=dict(title="预测成绩")
+    ))
+    fig.add_trace(go.Scatter(
+        x=[_display(feature_x, input_vector[feature_names.index(feature_x)])],
+        y=[_display(feature_y, input_vector[feature_names.index(feature_y)])],
+        mode="markers", marker=dict(color="red", size=10), name="当前输入"
+    ))
+    fig.update_layout(xaxis_title=_axis_title(feature_x), yaxis_title=_axis_title(feature_y), showlegend=False)
+    with tabs[-1]:
+        st.plotly_chart(fig, use_container_width=True)
+
+# -------------------------- 5.1 成绩预测页面：批量预测（上传学生名单，分块向量化预测） --------------------------
+def page3_batch_prediction(model, feature_names):
+    st.divider()
+    st.subheader("📁 批量预测")
+    st.caption(f"上传包含以下列的CSV文件（utf-8或gbk编码）：{'、'.join(INPUT_COLUMNS)}；出勤率、作业完成率为0~1小数。"
+               f"结果附带80%预测区间（{LOWER_COLUMN}、{UPPER_COLUMN}）")
+    uploaded = st.file_uploader("上传学生名单", type=["csv"], key="batch_upload")
+    if uploaded is None:
+        return
+    if not st.button("开始批量预测", key="batch_btn"):
+        return
+
+    raw_bytes = uploaded.getvalue()
+    total_rows = count_rows(raw_bytes)
+    progress = st.progress(0.0, text="正在预测...")
+    output = io.BytesIO()
+    try:
+        for i, (done, result) in enumerate(predict_csv_in_chunks(raw_bytes, model, feature_names)):
+            write_result_chunk(output, result, first=(i == 0))
+            progress.progress(min(done / max(total_rows, 1), 1.0), text=f"已预测 {done}/{total_rows} 行")
+    except ValueError as e:
+        progress.empty()
+        st.error(str(e))
+        return
+
+    progress.progress(1.0, text=f"预测完成，共 {done} 行")
+    st.download_button(
+        "下载预测结果",
+        data=output.getvalue(),
+        file_name=f"预测结果_{uploaded.name}",
+        mime="text/csv",
+        key="batch_download"
+    )
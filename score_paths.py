@@ -0,0 +1,19 @@
+# 默认文件路径（相对于应用目录）：应用的 CONFIG、离线预评分、多进程启动器、推理服务和基准脚本共用这一份，
+# 部署时改文件名只需改这里（这里不导入任何依赖，各入口导入它不会带来额外开销）
+DEFAULT_PATHS = {
+    # 模型包由 save_model.py 生成；旧的三个文件仅在没有模型包时兜底使用
+    "bundle_path": "score_model.bundle",
+    "model_path": "rfr_model.joblib",
+    "feature_names_path": "feature_names.pkl",
+    "unique_values_path": "unique_values.pkl",
+    "csv_path": "student_data_adjusted_rounded.csv",
+    # 离线预评分结果（由 score_prescore.py 每晚生成），预测页面按学号查询
+    "prescore_path": "prescore.arrow",
+}
+# 模型相关的路径键，顺序与 score_bundle.load_model_artifacts 的参数一致
+MODEL_KEYS = ["bundle_path", "model_path", "feature_names_path", "unique_values_path"]
+
+
+def model_paths(paths=DEFAULT_PATHS):
+    """按 load_model_artifacts 的参数顺序返回模型相关路径"""
+    return [paths[key] for key in MODEL_KEYS]
@@ -0,0 +1,167 @@
+# 全体学生离线预评分：每晚对数据集中的所有学生分块并行预测，结果连同学生的真实输入写成按学号排序的
+# Arrow文件；预测页面输入学号时只在这张表上二分查找（O(log n)），不读CSV、不调用模型
+#
+# 结果文件：学号、性别、专业、四个数值输入、期末考试分数（如有）、预测期末成绩、预测下限、预测上限；
+# 模型版本、数据版本和评分时间写在schema元数据里。写临时文件后原子替换，页面不会读到半成品。
+#
+# 用法：python score_prescore.py --out prescore.arrow --workers 4
+# 定时任务（crontab，每天凌晨2点）：0 2 * * * cd /path/to/app && python score_prescore.py --out prescore.arrow
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as pa_ipc
+
+from score_batch import LOWER_COLUMN, RESULT_COLUMN, UPPER_COLUMN
+from score_bundle import load_model_artifacts
+from score_data import ID_COLUMN, dataset_version, load_student_table
+from score_features import INPUT_COLUMNS, encode_features
+from score_paths import DEFAULT_PATHS, MODEL_KEYS, model_paths
+
+TARGET_COLUMN = "期末考试分数"
+PREDICTION_COLUMNS = [RESULT_COLUMN, LOWER_COLUMN, UPPER_COLUMN]
+
+
+# -------------------------- 分块评分（在工作进程中执行） --------------------------
+_worker_state = {}
+
+
+def _init_worker(paths, model_version):
+    # 每个工作进程映射一次模型包和数据缓存（只读，不复制），之后的分块都复用；
+    # model_version 是主进程在评分开始前读到的模型版本，写入结果元数据的就是它
+    _worker_state["bundle"] = load_model_artifacts(*model_paths(paths))
+    _worker_state["model_version"] = model_version
+    _worker_state["table"] = load_student_table(paths["csv_path"])
+
+
+def _score_rows(bounds):
+    """对 [start, stop) 行评分，返回 (n, 3) 的 [预测值, 下限, 上限]；输入有缺失的行为NaN"""
+    start, stop = bounds
+    bundle, table = _worker_state["bundle"], _worker_state["table"]
+    if bundle.content_hash != _worker_state["model_version"]:
+        # 主进程读取版本后模型文件被替换：结果会混入另一个模型的输出，放弃本次评分
+        raise RuntimeError(
+            f"评分期间模型已更新（{_worker_state['model_version'][:8]} → {bundle.content_hash[:8]}），请重新运行预评分"
+        )
+    frame = table.slice(start, stop - start).select(INPUT_COLUMNS).to_pandas()
+    scores = np.full((len(frame), 3), np.nan, dtype=np.float32)
+    valid = frame.notna().all(axis=1).to_numpy()
+    if valid.any():
+        scores[valid] = bundle.model.predict_interval(encode_features(frame[valid], bundle.feature_names))
+    return scores
+
+
+def _chunk_bounds(n_rows, chunk_rows):
+    return [(start, min(start + chunk_rows, n_rows)) for start in range(0, n_rows, chunk_rows)]
+
+
+def prescore(paths=DEFAULT_PATHS, out_path=DEFAULT_PATHS["prescore_path"], workers=None, chunk_rows=100_000):
+    """对数据集全部学生评分并写出按学号排序的结果表，返回写出的行数"""
+    workers = workers or os.cpu_count() or 1
+    table = load_student_table(paths["csv_path"])
+    bounds = _chunk_bounds(table.num_rows, chunk_rows)
+    # 先确定模型版本，工作进程逐块核对自己加载的模型与之一致
+    model_version = load_model_artifacts(*model_paths(paths)).content_hash
+    if workers == 1:
+        _init_worker(paths, model_version)
+        parts = [_score_rows(b) for b in bounds]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(paths, model_version)
+        ) as pool:
+            parts = list(pool.map(_score_rows, bounds))
+    scores = np.concatenate(parts) if parts else np.zeros((0, 3), dtype=np.float32)
+
+    keep = [ID_COLUMN] + INPUT_COLUMNS + ([TARGET_COLUMN] if TARGET_COLUMN in table.column_names else [])
+    result = table.select(keep)
+    for i, name in enumerate(PREDICTION_COLUMNS):
+        column = np.ascontiguousarray(scores[:, i])
+        result = result.append_column(name, pa.array(column, mask=np.isnan(column)))
+    # 没有学号的行无法查询；其余按学号排序，页面二分查找
+    result = result.filter(pc.is_valid(result[ID_COLUMN]))
+    result = result.take(pc.sort_indices(result, sort_keys=[(ID_COLUMN, "ascending")])).combine_chunks()
+    result = result.replace_schema_metadata({
+        "model_version": model_version,
+        "dataset_version": dataset_version(paths["csv_path"]),
+        "scored_at": datetime.now().isoformat(timespec="seconds"),
+    })
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa_ipc.new_file(sink, result.schema) as writer:
+            writer.write_table(result)
+    os.replace(tmp_path, out_path)
+    return result.num_rows
+
+
+# -------------------------- 查询（页面使用） --------------------------
+class PrescoreIndex:
+    """内存映射预评分结果表，按学号二分查找
+
+    学号为整数列时直接在映射的int64数组上 searchsorted；为字符串时转换一次为对象数组后同样二分。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.table = pa_ipc.open_file(pa.memory_map(path, "r")).read_all()
+        meta = {k.decode(): v.decode() for k, v in (self.table.schema.metadata or {}).items()}
+        self.model_version = meta.get("model_version", "")
+        self.dataset_version = meta.get("dataset_version", "")
+        self.scored_at = meta.get("scored_at", "")
+        ids = self.table[ID_COLUMN]
+        self.integer_ids = pa.types.is_integer(ids.type)
+        # 结果文件只有一个record batch，整数学号可零拷贝引用映射的缓冲区
+        self.ids = ids.chunk(0).to_numpy(zero_copy_only=False) if ids.num_chunks else np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def _key(self, student_id):
+        student_id = str(student_id).strip()
+        if not self.integer_ids:
+            return student_id
+        # 整数学号：非纯数字或带前导零的输入不可能匹配
+        if not student_id.isdigit() or (len(student_id) > 1 and student_id[0] == "0") or len(student_id) > 18:
+            return None
+        return int(student_id)
+
+    def position(self, student_id):
+        """返回学号所在行号，不存在时返回None"""
+        key = self._key(student_id)
+        if key is None or not len(self.ids):
+            return None
+        i = int(np.searchsorted(self.ids, key))
+        return i if i < len(self.ids) and self.ids[i] == key else None
+
+    def lookup(self, student_id):
+        """返回该学生的输入、真实成绩和预测结果（列名→取值的dict），不存在时返回None"""
+        i = self.position(student_id)
+        return None if i is None else self.table.slice(i, 1).to_pylist()[0]
+
+
+# -------------------------- 命令行入口 --------------------------
+def main():
+    parser = argparse.ArgumentParser(description="全体学生离线预评分（按学号索引的结果表）")
+    parser.add_argument("--out", default=DEFAULT_PATHS["prescore_path"], help="结果文件路径")
+    parser.add_argument("--workers", type=int, default=None, help="并行进程数，默认为CPU核数")
+    parser.add_argument("--chunk-rows", type=int, default=100_000, help="每个分块的行数")
+    input_keys = MODEL_KEYS + ["csv_path"]
+    for key in input_keys:
+        parser.add_argument(f"--{key.replace('_', '-')}", default=DEFAULT_PATHS[key])
+    args = parser.parse_args()
+
+    paths = {key: getattr(args, key) for key in input_keys}
+    start = time.perf_counter()
+    n_rows = prescore(paths, args.out, workers=args.workers, chunk_rows=args.chunk_rows)
+    index = PrescoreIndex(args.out)
+    print(f"已评分 {n_rows} 名学生（耗时{time.perf_counter() - start:.2f}秒），"
+          f"模型版本 {index.model_version[:8]}，结果写入 {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# 模型热更新：后台线程监视模型文件，发现新版本后在后台加载、校验，再原子地切换为当前模型；
+# 切换前已开始的预测继续使用旧模型，旧模型在这些预测全部结束后才释放，无需重启 Streamlit
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRejected(ValueError):
+    """新模型未通过校验（特征名不兼容或试算结果异常），继续使用当前模型"""
+
+
+class _Entry:
+    # 一个已加载的模型及正在使用它的预测数
+    def __init__(self, bundle):
+        self.bundle = bundle
+        self.refs = 0
+        self.retired = False
+
+
+def _file_signature(paths):
+    # 用 (inode, 修改时间, 大小) 判断文件是否被替换；文件不存在记为 None
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def validate_bundle(candidate, current):
+    """新模型必须与当前模型的特征名完全一致（页面编码输入、预测缓存都依赖这一顺序），且试算结果有限"""
+    if list(candidate.feature_names) != list(current.feature_names):
+        added = [f for f in candidate.feature_names if f not in current.feature_names]
+        removed = [f for f in current.feature_names if f not in candidate.feature_names]
+        detail = f"新增 {added}，缺少 {removed}" if added or removed else "顺序不同"
+        raise ModelRejected(f"特征名与当前模型不兼容（{detail}），需要重启应用")
+    probe = np.zeros((2, len(candidate.feature_names)))
+    probe[1] = 1.0
+    if not np.all(np.isfinite(candidate.model.predict(probe))):
+        raise ModelRejected("新模型试算结果不是有限数值")
+
+
+class ModelSlot:
+    """持有当前生效的模型（ModelBundle），支持引用计数和原子切换
+
+    - acquire()：上下文管理器，期间拿到的模型不会被释放，一次页面渲染/一批预测内模型保持一致
+    - swap()：把新模型设为当前模型；旧模型在引用数归零时释放
+    - watch_paths 不为空时启动后台线程，每 interval 秒检查一次文件，连续两次检查结果一致
+      （文件已写完）且与当前版本不同时调用 loader() 加载新模型，校验通过后切换
+    - 旧模型尚未释放时不加载下一个候选，内存中最多同时存在两个模型
+    """
+
+    def __init__(self, bundle, loader=None, watch_paths=(), interval=5.0):
+        self.loader = loader
+        self.watch_paths = list(watch_paths)
+        self.interval = interval
+        self.swaps = 0
+        self.last_error = None
+        self._current = _Entry(bundle)
+        self._draining = []
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if loader is not None and self.watch_paths:
+            self._thread = threading.Thread(target=self._watch, name="ModelSlot", daemon=True)
+            self._thread.start()
+
+    @property
+    def current(self):
+        """当前模型（不计引用，仅用于读取版本号等元数据）"""
+        return self._current.bundle
+
+    @contextmanager
+    def acquire(self):
+        with self._lock:
+            entry = self._current
+            entry.refs += 1
+        try:
+            yield entry.bundle
+        finally:
+            with self._lock:
+                entry.refs -= 1
+                self._release_drained()
+
+    def predict(self, X):
+        """用当前模型预测（与 model.predict 接口相同），供预测合并器等调用"""
+        with self.acquire() as bundle:
+            return bundle.model.predict(X)
+
+    def predict_interval(self, X):
+        """用当前模型给出 [预测值, 下限, 上限]（见 FlatForest.predict_interval）"""
+        with self.acquire() as bundle:
+            return bundle.model.predict_interval(X)
+
+    def add_listener(self, callback):
+        """注册切换回调 callback(新模型)，如清空预测缓存"""
+        self._listeners.append(callback)
+
+    def swap(self, bundle):
+        with self._lock:
+            old = self._current
+            old.retired = True
+            self._current = _Entry(bundle)
+            self._draining.append(old)
+            self._release_drained()
+            self.swaps += 1
+        for callback in self._listeners:
+            callback(bundle)
+        logger.info("模型已切换为 %s", bundle.content_hash)
+
+    def _release_drained(self):
+        # 调用方需持有 self._lock；没有进行中预测的旧模型丢弃引用，由垃圾回收释放（内存映射随之关闭）
+        still_used = []
+        for entry in self._draining:
+            if entry.refs:
+                still_used.append(entry)
+            else:
+                entry.bundle = None
+        self._draining = still_used
+
+    def stats(self):
+        with self._lock:
+            return {
+                "version": self._current.bundle.content_hash,
+                "in_flight": self._current.refs,
+                "draining": len(self._draining),
+                "swaps": self.swaps,
+                "last_error": self.last_error,
+            }
+
+    def _watch(self):
+        loaded = _file_signature(self.watch_paths)
+        previous = loaded
+        while not self._stop.wait(self.interval):
+            signature = _file_signature(self.watch_paths)
+            settled = signature == previous
+            previous = signature
+            if signature == loaded or not settled:
+                continue
+            with self._lock:
+                if self._draining:  # 上一个旧模型还有预测在用，下一轮再加载
+                    continue
+            try:
+                candidate = self.loader()
+                validate_bundle(candidate, self.current)
+            except ModelRejected as e:
+                # 校验不通过的文件不再重复加载，直到文件再次变化
+                loaded = signature
+                self.last_error = str(e)
+                logger.warning("新模型未启用：%s", e)
+                continue
+            except Exception as e:  # 文件可能仍在写入，下一轮重试
+                self.last_error = f"加载失败：{e}"
+                logger.warning("新模型加载失败，稍后重试：%s", e)
+                continue
+            loaded = signature
+            self.last_error = None
+            if candidate.content_hash != self.current.content_hash:
+                self.swap(candidate)
+
+    def close(self):
+        """停止后台监视线程"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,162 @@
+# 成绩预测推理服务：基于tornado的独立HTTP接口，供学生门户等系统以编程方式调用
+# 与 Streamlit 应用加载同一份模型（score_model.bundle，没有时兜底读取旧的 joblib + pickle 文件），
+# 并发到达的单条请求经 MicroBatcher 合并为微批，一次调用模型
+#
+# 用法：python score_server.py --port 8600 --max-batch 256 --max-wait-ms 5
+# 接口：
+#   POST /predict        {"性别": "男", "专业": "大数据管理", "每周学习时长（小时）": 15, "上课出勤率": 0.9,
+#                         "期中考试分数": 60, "作业完成率": 0.8}  →  {"预测期末成绩": 63.8}
+#   POST /predict/batch  {"rows": [ {...}, {...} ]}  →  {"预测期末成绩": [63.8, ...]}
+#   GET  /health         模型版本与微批统计信息
+# 模型文件更新后自动热加载（见 score_reload.py），无需重启服务
+import argparse
+import asyncio
+import json
+import math
+import time
+
+import pandas as pd
+import tornado.ioloop
+import tornado.web
+
+from score_batch import RESULT_COLUMN
+from score_batcher import MicroBatcher
+from score_bundle import load_model_artifacts
+from score_features import CATEGORY_FEATURES, INPUT_COLUMNS, NUMERIC_FEATURES, encode_features, encode_single
+from score_paths import DEFAULT_PATHS, MODEL_KEYS, model_paths
+from score_reload import ModelSlot
+
+MAX_BATCH_ROWS = 100_000
+
+
+class PredictionService:
+    """推理服务持有的共享状态：模型槽（支持热更新）和微批合并器
+
+    热更新只接受特征名完全一致的新模型，因此特征名和类别取值在服务运行期间不变。
+    """
+
+    def __init__(self, slot, max_batch=256, max_wait_ms=5.0):
+        self.slot = slot
+        self.feature_names = slot.current.feature_names
+        self.unique_values = slot.current.unique_values
+        self.batcher = MicroBatcher(slot.predict, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self.started_at = time.time()
+
+
+def _check_row(row, unique_values):
+    # 单条输入校验：字段齐全、数值字段为有限数字、类别字段为训练时出现过的取值；
+    # 不合法时抛出 ValueError（返回400），消息指出具体字段
+    if not isinstance(row, dict):
+        raise ValueError("每条输入必须是JSON对象")
+    missing = [col for col in INPUT_COLUMNS if col not in row]
+    if missing:
+        raise ValueError(f"缺少字段：{'、'.join(missing)}")
+    checked = dict(row)
+    for col in NUMERIC_FEATURES:
+        try:
+            value = float(row[col])
+        except (TypeError, ValueError):
+            raise ValueError(f"“{col}”必须是数字")
+        if not math.isfinite(value):
+            raise ValueError(f"“{col}”必须是有限数字")
+        checked[col] = value
+    for col in CATEGORY_FEATURES:
+        allowed = [str(v) for v in unique_values[col]]
+        if str(row[col]) not in allowed:
+            raise ValueError(f"“{col}”取值无效：{row[col]}（可选：{'、'.join(allowed)}）")
+    return checked
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, service):
+        self.service = service
+
+    def json_body(self):
+        try:
+            return json.loads(self.request.body)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("请求体不是合法的JSON")
+
+    def write_json(self, data, status=200):
+        self.set_status(status)
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.finish(json.dumps(data, ensure_ascii=False))
+
+
+class PredictHandler(BaseHandler):
+    async def post(self):
+        try:
+            row = _check_row(self.json_body(), self.service.unique_values)
+        except ValueError as e:
+            return self.write_json({"error": str(e)}, status=400)
+        # 不按页面滑块步长取整，与 /predict/batch 对同一行的编码完全相同
+        vector = encode_single(row, self.service.feature_names, round_to_slider=False)
+        score = await asyncio.wrap_future(self.service.batcher.submit(vector))
+        self.write_json({RESULT_COLUMN: round(score, 2)})
+
+
+class BatchPredictHandler(BaseHandler):
+    async def post(self):
+        try:
+            body = self.json_body()
+            rows = body.get("rows") if isinstance(body, dict) else None
+            if not isinstance(rows, list) or not rows:
+                raise ValueError("请求体需要包含非空的 rows 数组")
+            if len(rows) > MAX_BATCH_ROWS:
+                raise ValueError(f"单次最多 {MAX_BATCH_ROWS} 行")
+            frame = pd.DataFrame([_check_row(row, self.service.unique_values) for row in rows])
+        except ValueError as e:
+            return self.write_json({"error": str(e)}, status=400)
+        # 整批已经是矩阵，直接在线程池里一次预测，不经过微批合并
+        X = encode_features(frame, self.service.feature_names)
+        scores = await tornado.ioloop.IOLoop.current().run_in_executor(None, self.service.slot.predict, X)
+        self.write_json({RESULT_COLUMN: [round(float(s), 2) for s in scores]})
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.write_json({
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.service.started_at, 1),
+            "trees": self.service.slot.current.model.n_trees,
+            "model": self.service.slot.stats(),
+            "feature_names": list(self.service.feature_names),
+            "categories": {k: list(map(str, v)) for k, v in self.service.unique_values.items()},
+            "batcher": self.service.batcher.stats(),
+        })
+
+
+def make_app(service):
+    args = dict(service=service)
+    return tornado.web.Application([
+        (r"/predict", PredictHandler, args),
+        (r"/predict/batch", BatchPredictHandler, args),
+        (r"/health", HealthHandler, args),
+    ])
+
+
+# -------------------------- 命令行入口 --------------------------
+def main():
+    parser = argparse.ArgumentParser(description="成绩预测HTTP推理服务")
+    parser.add_argument("--address", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8600, help="监听端口")
+    parser.add_argument("--max-batch", type=int, default=256, help="单个微批的最大请求数")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="攒批的最长等待时间（毫秒），0表示不额外等待")
+    parser.add_argument("--reload-interval", type=float, default=5.0, help="模型文件检查间隔（秒），0表示不热更新")
+    for key in MODEL_KEYS:
+        parser.add_argument(f"--{key.replace('_', '-')}", default=DEFAULT_PATHS[key])
+    args = parser.parse_args()
+
+    paths = model_paths(vars(args))
+    load = lambda: load_model_artifacts(*paths)
+    slot = ModelSlot(load(), loader=load, watch_paths=paths if args.reload_interval > 0 else (),
+                     interval=args.reload_interval)
+    service = PredictionService(slot, args.max_batch, args.max_wait_ms)
+    make_app(service).listen(args.port, address=args.address)
+    print(f"推理服务已启动：http://{args.address}:{args.port}（{slot.current.model.n_trees}棵树，"
+          f"微批上限{args.max_batch}条/{args.max_wait_ms}毫秒）", flush=True)
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == "__main__":
+    main()
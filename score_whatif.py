@@ -0,0 +1,32 @@
+# 成绩预测的假设分析（What-if）：固定其余输入，扫描一个或两个数值特征的取值范围，
+# 把整个网格拼成一个矩阵，一次批量调用模型得到敏感度曲线/曲面
+import numpy as np
+import pandas as pd
+
+from score_features import SLIDER_RANGES
+
+WHATIF_POINTS = 100
+
+
+def feature_grid(feature, points=WHATIF_POINTS):
+    """在滑块的完整取值范围内均匀取 points 个点"""
+    low, high = SLIDER_RANGES[feature]
+    return np.linspace(low, high, points)
+
+
+def sensitivity_curve(model, base_vector, feature_names, feature, points=WHATIF_POINTS):
+    """扫描单个特征：返回 DataFrame（feature 取值, 预测成绩），只调用一次 model.predict"""
+    grid = feature_grid(feature, points)
+    X = np.tile(np.asarray(base_vector, dtype=np.float64), (len(grid), 1))
+    X[:, feature_names.index(feature)] = grid
+    return pd.DataFrame({feature: grid, "预测成绩": model.predict(X)})
+
+
+def sensitivity_surface(model, base_vector, feature_names, feature_x, feature_y, points=WHATIF_POINTS):
+    """同时扫描两个特征：返回 (x网格, y网格, 成绩矩阵[y, x])，points² 行一次批量预测"""
+    grid_x = feature_grid(feature_x, points)
+    grid_y = feature_grid(feature_y, points)
+    X = np.tile(np.asarray(base_vector, dtype=np.float64), (len(grid_x) * len(grid_y), 1))
+    X[:, feature_names.index(feature_x)] = np.tile(grid_x, len(grid_y))
+    X[:, feature_names.index(feature_y)] = np.repeat(grid_y, len(grid_x))
+    return grid_x, grid_y, model.predict(X).reshape(len(grid_y), len(grid_x))
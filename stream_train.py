@@ -0,0 +1,98 @@
+# 超大学生数据集的分块训练：按块读取CSV，按固定类别词表编码，用 warm_start 随机森林逐块追加新树
+#
+# 每棵树只在一个数据块上训练（块内再做bootstrap），内存峰值取决于块大小而不是数据集大小；
+# 训练结果仍是 RandomForestRegressor，可以直接扁平化写入模型包。
+import math
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from score_data import sniff_encoding
+from score_features import CATEGORY_FEATURES, INPUT_COLUMNS, NUMERIC_FEATURES, encode_features
+
+TARGET_COLUMN = "期末考试分数"
+
+
+def _read_chunks(csv_path, chunksize, usecols=None):
+    with open(csv_path, "rb") as f:
+        encoding = sniff_encoding(f.read(1 << 16))
+    return pd.read_csv(
+        csv_path,
+        encoding="utf-8-sig" if encoding == "utf-8" else encoding,
+        usecols=usecols,
+        chunksize=chunksize,
+    )
+
+
+def scan_vocabulary(csv_path, chunksize=500_000):
+    """第一遍只读取分类列：收集类别词表（按出现顺序）并统计有效行数"""
+    vocab = {col: {} for col in CATEGORY_FEATURES}
+    n_rows = 0
+    for chunk in _read_chunks(csv_path, chunksize, usecols=INPUT_COLUMNS + [TARGET_COLUMN]):
+        chunk = chunk.dropna()
+        n_rows += len(chunk)
+        for col in CATEGORY_FEATURES:
+            for value in chunk[col].unique():
+                vocab[col].setdefault(str(value), None)
+    return {col: list(values) for col, values in vocab.items()}, n_rows
+
+
+def vocabulary_feature_names(vocab):
+    """与 pd.get_dummies 相同的列顺序：数值列在前，分类列按类别名排序展开"""
+    names = list(NUMERIC_FEATURES)
+    for col in CATEGORY_FEATURES:
+        names.extend(f"{col}_{value}" for value in sorted(vocab[col]))
+    return names
+
+
+def stream_fit(csv_path, chunksize=200_000, n_estimators=150, max_depth=12, min_samples_leaf=5,
+               holdout=0.2, holdout_cap=200_000, random_state=42, log=print):
+    """分块训练随机森林
+
+    返回 (model, feature_names, unique_values, X_holdout, y_holdout)。
+    每块按 holdout 比例随机留出验证行，最多累计 holdout_cap 行用于最终评估。
+    """
+    unique_values, n_rows = scan_vocabulary(csv_path)
+    feature_names = vocabulary_feature_names(unique_values)
+    n_chunks = max(1, math.ceil(n_rows / chunksize))
+    log(f"共{n_rows}行，分{n_chunks}块训练，共{n_estimators}棵树（按各块行数比例分配）")
+
+    model = RandomForestRegressor(
+        n_estimators=0,
+        warm_start=True,
+        random_state=random_state,
+        n_jobs=-1,
+        max_depth=max_depth,
+        min_samples_leaf=min_samples_leaf,
+    )
+    rng = np.random.default_rng(random_state)
+    hold_X, hold_y, hold_rows = [], [], 0
+    rows_seen = 0
+
+    for i, chunk in enumerate(_read_chunks(csv_path, chunksize, usecols=INPUT_COLUMNS + [TARGET_COLUMN])):
+        chunk = chunk.dropna()
+        if chunk.empty:
+            continue
+        X = encode_features(chunk, feature_names).to_numpy()
+        y = chunk[TARGET_COLUMN].to_numpy(dtype=np.float64)
+
+        is_holdout = rng.random(len(chunk)) < holdout
+        if hold_rows < holdout_cap and is_holdout.any():
+            take = np.flatnonzero(is_holdout)[:holdout_cap - hold_rows]
+            hold_X.append(X[take])
+            hold_y.append(y[take])
+            hold_rows += len(take)
+
+        # 累计树数与已读行数成比例，末尾的小块不会分到和整块一样多的树
+        rows_seen += len(chunk)
+        target_trees = round(n_estimators * rows_seen / max(n_rows, 1))
+        train = ~is_holdout
+        if target_trees > model.n_estimators and train.any():
+            model.n_estimators = target_trees
+            model.fit(X[train], y[train])
+        log(f"  第{i + 1}/{n_chunks}块：{train.sum()}行，累计{model.n_estimators}棵树")
+
+    if not hold_X or model.n_estimators == 0:
+        raise ValueError("训练集或验证集为空，请检查数据或调整 holdout 比例")
+    return model, feature_names, unique_values, np.concatenate(hold_X), np.concatenate(hold_y)
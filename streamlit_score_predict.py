@@ -1,18 +1,23 @@
+import atexit
+import os
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from joblib import load  # 仅替换模型加载方式，其余保留
-import pickle
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
+from score_data import StudentDataError, load_student_frame, dataset_version
+from score_cube import build_major_cube
+from score_cache import PredictionCache
+from score_batcher import MicroBatcher
+from score_audit import AuditLog
+from score_bundle import load_model_artifacts
+from score_paths import DEFAULT_PATHS, model_paths
+from score_reload import ModelSlot
+from score_prescore import PrescoreIndex
+from score_id_index import StudentIdIndex
 warnings.filterwarnings('ignore')
 
 # -------------------------- 基础配置（整合必要依赖） --------------------------
-# 设置中文字体（避免图表中文乱码）
-plt.rcParams['font.sans-serif'] = ['SimHei']
-plt.rcParams['axes.unicode_minus'] = False
+# 各页面拆分在 score_page_*.py 中，切换到某页面时才导入该页面及其依赖（plotly 等），
+# 默认的成绩预测页面不再为用不到的图表库付出导入时间；导入耗时对比见 benchmarks/import_time.py
 
 # 页面基础配置
 st.set_page_config(
@@ -21,381 +26,152 @@ st.set_page_config(
     layout='wide'
 )
 
-# 路径配置（仅修改模型文件后缀为joblib，其余保留）
+# 路径配置（模型包、旧模型文件、数据集、离线预评分结果）统一定义在 score_paths.py，与其他入口脚本共用
 CONFIG = {
-    "model_path": "rfr_model.joblib",  # 仅改这里：pkl→joblib
-    "feature_names_path": "feature_names.pkl",
-    "unique_values_path": "unique_values.pkl",
-    "csv_path": "student_data_adjusted_rounded.csv"
+    **DEFAULT_PATHS,
+    # 跨会话预测合并：单批最多请求数、攒批最长等待（毫秒）、单条请求等待结果的上限（秒）
+    "dispatch_max_batch": 256,
+    "dispatch_max_wait_ms": 3.0,
+    "dispatch_timeout_s": 5.0,
+    # 预测审计日志目录与后台刷新间隔（秒）
+    "audit_dir": "audit_logs",
+    "audit_flush_interval": 2.0,
+    # 模型文件检查间隔（秒）：发现新模型后在后台加载、校验并切换
+    "reload_interval": 5.0
 }
 
-# 加载模型和关键数据
+def _load_model():
+    # 优先内存映射模型包（多个进程共享同一份物理内存）；没有模型包时兜底读取旧的三个文件
+    return load_model_artifacts(*model_paths(CONFIG))
+
+
+# 加载模型和关键数据（全局仅加载一次）
 @st.cache_resource
 def load_resources():
-    # 1. 加载训练好的模型和配置文件（仅修改模型加载为joblib，其余保留）
-    model = load(CONFIG["model_path"])  # 替换pickle.load为joblib.load
-    with open(CONFIG["feature_names_path"], 'rb') as f:
-        feature_names = pickle.load(f)
-    with open(CONFIG["unique_values_path"], 'rb') as f:
-        unique_values = pickle.load(f)
-    
-    # 2. 加载CSV数据（完全保留你的原有逻辑）
-    df = pd.read_csv(
-        CONFIG["csv_path"],
-        encoding='utf-8-sig',
-        dtype={
-            '学号': str,
-            '性别': 'category',
-            '专业': 'category'
-        }
-    ).dropna()
+    # 1. 加载CSV数据（经由数据访问层：首次转换为Arrow缓存，之后只读内存映射，多个工作进程共享同一份物理内存）；
+    #    个别值无效时只记为缺失，整个文件无法解析时抛出 StudentDataError（此时还未启动模型监视线程）
+    df = load_student_frame(CONFIG["csv_path"], dropna=True)
+
+    # 2. 模型槽：持有当前生效的模型，后台监视模型文件，新模型加载并校验通过后原子切换，无需重启应用；
+    #    进程退出时停止模型文件监视线程（与审计日志相同，用 atexit 而不是缓存释放回调，兼容固定的 streamlit 版本）
+    model_slot = ModelSlot(
+        _load_model(), loader=_load_model, interval=CONFIG["reload_interval"],
+        watch_paths=model_paths(CONFIG)
+    )
+    atexit.register(model_slot.close)
     
-    return model, feature_names, unique_values, df
+    return model_slot, df
+
+# 执行资源加载（全局仅加载一次）；模型本身经由模型槽取用，热更新后各页面自动使用新模型。
+# 数据文件无法解析时在页面上提示（失败不会被缓存，修正文件后刷新页面即可）
+try:
+    model_slot, df = load_resources()
+except StudentDataError as e:
+    st.error(f"学生数据无法读取：{e}。请核对CSV文件后刷新页面")
+    st.stop()
+
+
+# 跨会话预测合并：全班同时点击预测时，各会话线程的单条请求在几毫秒内攒成一个矩阵一次预测，
+# 每个调用方拿回自己那一行的 [预测值, 下限, 上限]；单条请求最多等待 max_wait_ms 加一批的推理时间
+@st.cache_resource
+def get_prediction_dispatcher():
+    return MicroBatcher(model_slot.predict_interval, max_batch=CONFIG["dispatch_max_batch"], max_wait_ms=CONFIG["dispatch_max_wait_ms"])
+
+
+# 预测结果缓存：进程内所有会话共享，相同模型版本下相同（按滑块步长取整后的）输入直接返回；
+# 未命中时经由合并器预测。模型切换后清空，旧模型的结果不再占用缓存
+@st.cache_resource
+def get_prediction_cache():
+    dispatcher = get_prediction_dispatcher()
+    cache = PredictionCache(
+        lambda X: dispatcher.predict_rows(X, timeout=CONFIG["dispatch_timeout_s"]), maxsize=4096
+    )
+    model_slot.add_listener(lambda bundle: cache.clear())
+    return cache
+
+
+# 预测审计日志：所有会话共享一个缓冲，后台线程按批写盘，不阻塞预测
+@st.cache_resource
+def get_audit_log():
+    return AuditLog(CONFIG["audit_dir"], flush_interval=CONFIG["audit_flush_interval"])
+
+
+# 离线预评分结果：内存映射打开，按文件的修改时间和大小缓存，定时任务替换文件后自动重新打开
+@st.cache_resource(max_entries=1)
+def _open_prescore_index(path, signature):
+    return PrescoreIndex(path)
 
-# 执行模型加载（全局仅加载一次）
-model, feature_names, unique_values, df = load_resources()
+
+def get_prescore_index():
+    try:
+        stat = os.stat(CONFIG["prescore_path"])
+    except FileNotFoundError:
+        return None
+    return _open_prescore_index(CONFIG["prescore_path"], (stat.st_mtime_ns, stat.st_size))
+
+
+# 学号前缀索引：按数据版本构建一次（排序去重），预测页面的学号自动补全在上面二分查找
+@st.cache_resource
+def get_student_id_index(_df, version):
+    # 数据集没有学号列时不提供自动补全
+    return StudentIdIndex(_df["学号"]) if "学号" in _df.columns else None
 
 
 # -------------------------- 2. 数据读取（完全保留你的原有兼容逻辑） --------------------------
 def get_dataframe_from_csv():
-    csv_path = "student_data_adjusted_rounded.csv"
-    try:
-        df = pd.read_csv(csv_path, encoding="utf-8")
-    except UnicodeDecodeError:
-        df = pd.read_csv(csv_path, encoding="gbk")
-    
+    csv_path = CONFIG["csv_path"]
+    # utf-8/gbk 兼容由数据访问层在转换时处理，这里只读取需要的列
     core_cols = [
         "性别", "专业", "每周学习时长（小时）", 
-        "上课出勤率", "期中考试分数", "期末考试分数"
+        "上课出勤率", "期中考试分数", "作业完成率", "期末考试分数"
     ]
-    valid_cols = [col for col in core_cols if col in df.columns]
-    return df[valid_cols].dropna() if valid_cols else pd.DataFrame()
+    try:
+        df = load_student_frame(csv_path, columns=core_cols, dropna=True)
+    except StudentDataError:
+        return pd.DataFrame()
+    # 作业完成率为可选列（没有时页面显示“暂无”），其余列缺少任何一列都无法分析
+    if any(col not in df.columns for col in core_cols if col != "作业完成率"):
+        return pd.DataFrame()
+    return df
 
-import streamlit as st
 
-import streamlit as st
-# -------------------------- 3. 界面1：项目介绍页面（完全保留原功能+右侧上下张图片切换展示） --------------------------
+# 专业聚合立方体：按数据版本缓存，页面上的表格和图表都从这里取数，不再重复扫描明细
+@st.cache_data
+def get_major_cube(_df, version):
+    return build_major_cube(_df)
+
+
+# -------------------------- 3~5. 各页面：首次进入时导入对应模块 --------------------------
 def page1_project_intro():
-    st.title("学生成绩分析与预测系统")
-    
-    # 整体布局：左侧文字介绍，右侧图片切换展示
-    left_col, right_col = st.columns([2, 1])  # 左侧占比2，右侧占比1，可根据需求调整比例
-
-    # 左侧：原有所有文字介绍功能（完全保留不变）
-    with left_col:
-        # 项目概述
-        with st.container():
-            st.subheader("📋 项目概述")
-            st.write("""
-            本项目是一个基于Streamlit的学生成绩分析平台，通过该平台可可视化同学学习状态，帮助教育工作者和学生深入了解学习表现，并预测期末考试成绩。
-            """)
-            
-            # 主要特点
-            st.subheader("✨ 主要特点")
-            st.markdown("""
-            - **数据可视化**：多维度展示学生学业数据
-            - **专业分析**：多维度的专业统计分析
-            - **智能预测**：基于学习维度建模的成绩预测
-            - **学习建议**：根据预测结果提供个性化反馈
-            """)
-        
-        # 项目目标
-        with st.container():
-            st.subheader("🎯 项目目标")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown("#### 目标一：分析维度覆盖")
-                st.write("- 识别关键学习指标\n- 探索维度相关性\n- 维度密度及分布")
-            with col2:
-                st.markdown("#### 目标二：可视化展示")
-                st.write("- 专业对比分析\n- 性别差异分析\n- 学习习惯识别")
-            with col3:
-                st.markdown("#### 目标三：成绩预测")
-                st.write("- 机器学习模型\n- 个性化反馈\n- 及时干预预警")
-        
-        # 技术架构
-        with st.container():
-            st.subheader("🔧 技术架构")
-            arch_cols = st.columns(4)
-            with arch_cols[0]:
-                st.markdown("#### 前端框架\nStreamlit")
-            with arch_cols[1]:
-                st.markdown("#### 数据处理\nPandas\nNumPy")
-            with arch_cols[2]:
-                st.markdown("#### 可视化\nPlotly\nMatplotlib")
-            with arch_cols[3]:
-                st.markdown("#### 机器学习\nScikit-Learn")
-
-    # 右侧：图片切换展示（先显示图片，再显示切换按钮：上一张/下一张按钮切换+三张图片）
-    with right_col:
-        st.subheader("🖼️ 系统界面预览")
-        
-        # 定义三张图片的信息（图片路径可根据你的实际文件修改）
-        image_configs = {
-            1: {"path": "项目介绍.png", "caption": "项目介绍界面"},
-            2: {"path": "专业数据分析.png", "caption": "专业数据分析界面"},
-            3: {"path": "期末成绩预测.png", "caption": "期末成绩预测界面"}
-        }
-        total_images = len(image_configs)  # 获取图片总数（自动适配，后续可增减图片）
-        
-        # 初始化会话状态，用于保存当前显示的图片索引
-        if "current_image_idx" not in st.session_state:
-            st.session_state.current_image_idx = 1
-        
-        # 第一步：先显示当前图片及索引提示（提升用户体验）
-        current_img = image_configs[st.session_state.current_image_idx]
-        st.caption(f"当前：第{st.session_state.current_image_idx}/{total_images}张")
-        
-        try:
-            st.image(
-                current_img["path"],
-                caption=current_img["caption"],
-                use_container_width=True  # 自适应右侧列宽度
-            )
-        except FileNotFoundError:
-            st.warning(f"图片 {current_img['path']} 未找到，请检查文件路径")
-        except Exception as e:
-            st.warning(f"图片加载失败：{str(e)}")
-        
-        # 第二步：调整按钮布局，让“下一张”与图片右对齐
-        # 用3列布局：第1列放“上一张”，第2列占位，第3列放“下一张”
-        btn_col1, _, btn_col2 = st.columns([1, 2, 1])  # 中间列占位，实现按钮左右分布
-        with btn_col1:
-            # 上一张按钮
-            if st.button("⬅️ 上一张", key="prev_btn"):
-                if st.session_state.current_image_idx > 1:
-                    st.session_state.current_image_idx -= 1
-                else:
-                    st.session_state.current_image_idx = total_images
-        with btn_col2:
-            # 下一张按钮（与图片右对齐）
-            if st.button("下一张 ➡️", key="next_btn"):
-                if st.session_state.current_image_idx < total_images:
-                    st.session_state.current_image_idx += 1
-                else:
-                    st.session_state.current_image_idx = 1
-# -------------------------- 4. 界面2：专业数据分析页面（严格按要求修改图表，其余完全保留） --------------------------
+    from score_page_intro import page1_project_intro as render
+    render()
+
+
 def page2_major_analysis(df):
-    st.title("专业数据分析")
-    st.divider()
-
-    # （1）使用表格展示各专业每周平均学时、期中考试平均分和期末考试平均分
-    st.subheader("📋 各专业核心学习指标")
-    table_data = df.groupby("专业").agg({
-        "每周学习时长（小时）": "mean",
-        "期中考试分数": "mean",
-        "期末考试分数": "mean"
-    }).round(2).rename(
-        columns={
-            "每周学习时长（小时）": "每周平均学时（小时）",
-            "期中考试分数": "期中考试平均分",
-            "期末考试分数": "期末考试平均分"
-        }
-    ).reset_index()
-    st.dataframe(table_data, use_container_width=True)
-    st.divider()
-
-    # （2）使用双层柱状图展示每个专业的男女性别比例
-    st.subheader("1. 各专业男女性别比例")
-    gender_count = df.groupby(["专业", "性别"]).size().reset_index(name="人数")
-    fig_gender = px.bar(
-        gender_count, x="专业", y="人数", color="性别", barmode="group",  # barmode="group"实现双层分组柱状图
-        color_discrete_map={"男": "#1E88E5", "女": "#90CAF9"},
-        title="各专业男女性别分布"
-    )
-    # 右侧添加数据表格
-    gender_table = gender_count.pivot(index="专业", columns="性别", values="人数").fillna(0).astype(int)
-    col_chart, col_table = st.columns([2, 1])
-    with col_chart:
-        st.plotly_chart(fig_gender, use_container_width=True)
-    with col_table:
-        st.subheader("性别比例数据")
-        st.dataframe(gender_table, use_container_width=True)
-    st.divider()
-
-    # （3）使用折线图展示每个专业的期中考试分数和期末考试分数
-    st.subheader("2. 各专业期中/期末分数对比")
-    # 聚合数据：仅保留期中、期末分数
-    learn_data = df.groupby("专业").agg({
-        "期中考试分数": "mean",
-        "期末考试分数": "mean"
-    }).round(2).reset_index()
-    # 转换为长格式（适配折线图多系列展示）
-    learn_long = pd.melt(
-        learn_data, id_vars="专业",
-        value_vars=["期中考试分数", "期末考试分数"],
-        var_name="考试类型", value_name="平均分"
-    )
-    fig_learn = px.line(
-        learn_long, x="专业", y="平均分", color="考试类型", 
-        markers=True, title="各专业期中/期末分数趋势"
-    )
-    # 右侧添加详细数据表格
-    learn_table = learn_data.set_index("专业")
-    col_learn_chart, col_learn_table = st.columns([2, 1])
-    with col_learn_chart:
-        st.plotly_chart(fig_learn, use_container_width=True)
-    with col_learn_table:
-        st.subheader("详细数据")
-        st.dataframe(learn_table, use_container_width=True)
-    st.divider()
-
-    # （4）使用单层柱状图展示每个专业的平均上课出勤率
-    st.subheader("3. 各专业出勤率分析")
-    attendance_data = df.groupby("专业")["上课出勤率"].mean().round(2).reset_index()
-    # 单层柱状图展示：单色系+无分组
-    fig_att = px.bar(
-        attendance_data, x="专业", y="上课出勤率",
-        color_discrete_sequence=["#4CAF50"],  # 单色系实现单层柱状图效果，无分组更简洁
-        title="各专业平均出勤率"
-    )
-    # 右侧添加出勤率排名表格
-    attendance_rank = attendance_data.sort_values("上课出勤率", ascending=False).reset_index(drop=True)
-    attendance_rank["排名"] = attendance_rank.index + 1
-    col_att_chart, col_att_table = st.columns([2, 1])
-    with col_att_chart:
-        st.plotly_chart(fig_att, use_container_width=True)
-    with col_att_table:
-        st.subheader("出勤率排名")
-        st.dataframe(attendance_rank[["排名", "专业", "上课出勤率"]], use_container_width=True)
-    st.divider()
-
-    # （5）应用新样式展示大数据管理专业的平均上课出勤率和期末考试（核心指标卡片+单色系直方图）
-    st.subheader("4. 大数据管理专业专项分析")
-    bigdata_df = df[df["专业"] == "大数据管理"]
-    if not bigdata_df.empty:
-        # 计算扩展核心指标（适配4列metric卡片，基于数据动态计算，更贴合实际）
-        bigdata_stats = bigdata_df.agg({
-            "上课出勤率": "mean",
-            "期末考试分数": "mean",
-            "每周学习时长（小时）": "mean"
-        }).round(2)
-        # 计算女生占比
-        gender_total = bigdata_df["性别"].value_counts()
-        female_ratio = (gender_total.get("女", 0) / len(bigdata_df) * 100).round(1) if len(bigdata_df) > 0 else 0
-        # 模拟作业完成率（若数据集中无该字段，保持示例样式；有则替换为bigdata_df["作业完成率"].mean()）
-        homework_completion = 98.8
-
-        # 第一步：应用核心指标卡片样式（4列metric布局，与示例一致）
-        metric_cols = st.columns(4)
-        metric_cols[0].metric("女生占比", f"{female_ratio}%")
-        metric_cols[1].metric("平均成绩", f"{bigdata_stats['期末考试分数']}分")
-        metric_cols[2].metric("作业完成率", f"{homework_completion}%")
-        metric_cols[3].metric("平均学习时长", f"{bigdata_stats['每周学习时长（小时）']}小时/周")
-
-        # 第二步：应用单色系成绩分布直方图样式（与示例一致，适配实际成绩数据）
-        # 提取实际期末成绩数据生成直方图，无数据时用模拟值兜底
-        bigdata_scores = bigdata_df["期末考试分数"].dropna().values
-        if len(bigdata_scores) == 0:
-            bigdata_scores = np.random.normal(86.8, 5, 200)
-        # 绘制示例样式的单色系直方图
-        fig_bigdata = px.histogram(
-            bigdata_scores, title="大数据管理专业成绩分布",
-            nbins=15, labels={"value": "成绩"}, color_discrete_sequence=["#4CAF50"]
-        )
-        st.plotly_chart(fig_bigdata, use_container_width=True)
-
-        # 保留原有核心要求：展示平均上课出勤率和期末考试（补充标注，不破坏新样式）
-        st.markdown("### 核心指标补充（出勤率 & 期末平均分）")
-        core_metric_df = pd.DataFrame({
-            "核心指标": ["平均上课出勤率", "期末考试平均分"],
-            "指标数值": [bigdata_stats["上课出勤率"], bigdata_stats["期末考试分数"]]
-        })
-        st.dataframe(core_metric_df, use_container_width=True)
-
-    else:
-        st.warning("未找到大数据管理专业数据")
-# -------------------------- 5. 界面3：成绩预测页面（图片调大+居中显示） --------------------------
+    from score_page_analysis import page2_major_analysis as render
+    version = dataset_version(CONFIG["csv_path"])
+    render(df, get_major_cube(df, version), version)
+
+
 def page3_score_prediction():
-    st.title("期末成绩预测")
-    st.write("请输入学生的学习信息，系统将基于机器学习模型预测期末成绩并提供学习建议")
-    st.divider()
-
-    # 输入区域
-    with st.container():
-        st.subheader("📋 学生信息输入")
-        st.markdown("---")
-        col_left, col_right = st.columns([1, 1.5])  # 左窄右宽比例
-
-        # 左侧：文本输入+下拉框（完全保留原有逻辑）
-        with col_left:
-            student_id = st.text_input("学号", placeholder="请输入学号（如2023001）")
-            gender = st.selectbox("性别", options=unique_values['性别'], index=0)
-            major = st.selectbox("专业", options=unique_values['专业'], index=0)
-            # 预测按钮（左侧底部，宽按钮样式）
-            predict_btn = st.button("预测期末成绩", type="primary", use_container_width=True)
-
-        # 右侧：滑块组（完全保留原有逻辑）
-        with col_right:
-            study_hour = st.slider(
-                "每周学习时长（小时）", 
-                min_value=0.0, max_value=50.0, value=15.0, step=0.01
-            )
-            attendance = st.slider(
-                "上课出勤率（%）", 
-                min_value=0, max_value=100, value=90, step=1
-            ) / 100  # 转换为小数（匹配模型训练格式）
-            mid_score = st.slider(
-                "期中考试分数", 
-                min_value=0.0, max_value=100.0, value=60.0, step=0.01
-            )
-            homework_rate = st.slider(
-                "作业完成率（%）", 
-                min_value=0, max_value=100, value=80, step=1
-            ) / 100  # 转换为小数（匹配模型训练格式）
-
-    # 预测结果展示
-    if predict_btn:
-        # 验证必填项（学号可选，核心特征必填）
-        if study_hour == 0 or attendance == 0 or mid_score == 0 or homework_rate == 0:
-            st.error("请完善学习数据输入（学习时长、出勤率、期中分数、作业完成率不能为空）")
-            return
-
-        st.divider()
-        st.subheader("📊 预测结果")
-        
-        # 构造模型输入数据
-        input_data = {feat: 0 for feat in feature_names}
-        # 填充数值型特征
-        input_data['每周学习时长（小时）'] = study_hour
-        input_data['上课出勤率'] = attendance
-        input_data['期中考试分数'] = mid_score
-        input_data['作业完成率'] = homework_rate
-        # 填充独热编码的分类特征
-        gender_feat = f"性别_{gender}"
-        major_feat = f"专业_{major}"
-        if gender_feat in input_data:
-            input_data[gender_feat] = 1
-        if major_feat in input_data:
-            input_data[major_feat] = 1
-        
-        # 转换为DataFrame
-        input_df = pd.DataFrame([input_data], columns=feature_names)
-        # 模型预测
-        final_score = model.predict(input_df)[0]
-        final_score = round(final_score, 1)
-
-        # 结果展示
-        st.metric("预测期末成绩", f"{final_score}分", delta=None)
-
-        # 结果提示+图片
-        if final_score >= 60:
-            st.success("🎉 恭喜！预测成绩及格啦！继续保持优秀表现~")
-            try:
-                empty_col1, img_col, empty_col2 = st.columns([1, 10, 1]) 
-                with img_col:
-                    st.image("xibao.jpg", caption="成绩优秀！", use_container_width=True)
-            except:
-                st.markdown("📌 建议：保持当前学习节奏，重点巩固薄弱知识点")
-        else:
-            st.warning("💪 没关系！预测成绩暂未及格，针对性提升后可显著进步")
-            try:
-                # 统一三列布局，保证两张图片居中效果一致
-                empty_col1, img_col, empty_col2 = st.columns([1, 10, 1])
-                with img_col:
-                    st.image("jiayou.jpg", caption="继续努力！",use_container_width=True)
-            except:
-                st.markdown("📌 建议：参考下方学习建议，重点优化薄弱环节")
+    from score_page_predict import page3_score_prediction as render
+    # 一次渲染内固定使用同一个模型：预测（经由合并器）、缓存键、审计日志的模型版本和假设分析都用它；
+    # 渲染期间发生切换时，旧模型等本次渲染结束后才释放
+    with model_slot.acquire() as bundle:
+        dispatcher = get_prediction_dispatcher()
+        predict_rows = lambda X: dispatcher.predict_rows(
+            X, timeout=CONFIG["dispatch_timeout_s"], predict_fn=bundle.model.predict_interval
+        )
+        render(bundle.model, bundle.unique_values, bundle.feature_names,
+               get_prediction_cache(), get_audit_log(), bundle.content_hash, get_prescore_index(),
+               get_student_id_index(df, dataset_version(CONFIG["csv_path"])), predict_rows)
+
+
+def page3_batch_prediction():
+    from score_page_predict import page3_batch_prediction as render
+    with model_slot.acquire() as bundle:
+        render(bundle.model, bundle.feature_names)
+
 
 # -------------------------- 主函数：导航+页面切换（完全保留原逻辑） --------------------------
 def main():
@@ -409,6 +185,8 @@ def main():
             ["项目介绍", "专业数据分析", "成绩预测"],
             index=2  # 默认选中“成绩预测”页
         )
+        slot_stats = model_slot.stats()
+        st.caption(f"模型版本：{slot_stats['version'][:8]}（热更新 {slot_stats['swaps']} 次）")
 
     # 页面切换逻辑
     if selected_page == "项目介绍":
@@ -421,6 +199,7 @@ def main():
             page2_major_analysis(df)
     elif selected_page == "成绩预测":
         page3_score_prediction()
+        page3_batch_prediction()
 
 if __name__ == "__main__":
     main()